@@ -1,6 +1,14 @@
 import babelnet as bn
 from babelnet import Language, BabelSynsetID, BabelSenseSource
 from babelnet.data.relation import BabelPointer
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def get_target_lemma(synset_id: str) -> str:
+    """English lemma of a relation target, memoized since one synset often appears under several pointers."""
+    target_main = bn.get_synset(BabelSynsetID(synset_id)).main_sense(Language.EN)
+    return target_main.full_lemma if target_main else "N/A"
 
 
 def print_all_synset_data(synset_id: str):
@@ -65,65 +73,49 @@ def print_all_synset_data(synset_id: str):
     # Hypernyms (IS-A relationships)
     print("HYPERNYMS (IS-A):")
     for edge in synset.outgoing_edges(BabelPointer.ANY_HYPERNYM):
-        target_synset = bn.get_synset(edge.id_target)
-        target_main = target_synset.main_sense(Language.EN)
-        target_lemma = target_main.full_lemma if target_main else "N/A"
+        target_lemma = get_target_lemma(edge.id_target.id)
         print(f"{synset.id} - {edge.pointer} - {edge.id_target} - {target_lemma}")
 
     # Hyponyms (HAS-KIND relationships)
     print("\nHYPONYMS (HAS-KIND):")
     for edge in synset.outgoing_edges(BabelPointer.ANY_HYPONYM):
-        target_synset = bn.get_synset(edge.id_target)
-        target_main = target_synset.main_sense(Language.EN)
-        target_lemma = target_main.full_lemma if target_main else "N/A"
+        target_lemma = get_target_lemma(edge.id_target.id)
         print(f"{synset.id} - {edge.pointer} - {edge.id_target} - {target_lemma}")
 
     # Meronyms (HAS-PART relationships)
     print("\nMERONYMS (HAS-PART):")
     for edge in synset.outgoing_edges(BabelPointer.ANY_MERONYM):
-        target_synset = bn.get_synset(edge.id_target)
-        target_main = target_synset.main_sense(Language.EN)
-        target_lemma = target_main.full_lemma if target_main else "N/A"
+        target_lemma = get_target_lemma(edge.id_target.id)
         print(f"{synset.id} - {edge.pointer} - {edge.id_target} - {target_lemma}")
 
     # Holonyms (PART-OF relationships)
     print("\nHOLONYMS (PART-OF):")
     for edge in synset.outgoing_edges(BabelPointer.ANY_HOLONYM):
-        target_synset = bn.get_synset(edge.id_target)
-        target_main = target_synset.main_sense(Language.EN)
-        target_lemma = target_main.full_lemma if target_main else "N/A"
+        target_lemma = get_target_lemma(edge.id_target.id)
         print(f"{synset.id} - {edge.pointer} - {edge.id_target} - {target_lemma}")
 
     # Similar relationships
     print("\nSIMILAR:")
     for edge in synset.outgoing_edges(BabelPointer.SIMILAR_TO):
-        target_synset = bn.get_synset(edge.id_target)
-        target_main = target_synset.main_sense(Language.EN)
-        target_lemma = target_main.full_lemma if target_main else "N/A"
+        target_lemma = get_target_lemma(edge.id_target.id)
         print(f"{synset.id} - {edge.pointer} - {edge.id_target} - {target_lemma}")
 
     # Also relationships
     print("\nALSO:")
     for edge in synset.outgoing_edges(BabelPointer.ALSO):
-        target_synset = bn.get_synset(edge.id_target)
-        target_main = target_synset.main_sense(Language.EN)
-        target_lemma = target_main.full_lemma if target_main else "N/A"
+        target_lemma = get_target_lemma(edge.id_target.id)
         print(f"{synset.id} - {edge.pointer} - {edge.id_target} - {target_lemma}")
 
     # Derivation relationships
     print("\nDERIVATION:")
     for edge in synset.outgoing_edges(BabelPointer.DERIVATION):
-        target_synset = bn.get_synset(edge.id_target)
-        target_main = target_synset.main_sense(Language.EN)
-        target_lemma = target_main.full_lemma if target_main else "N/A"
+        target_lemma = get_target_lemma(edge.id_target.id)
         print(f"{synset.id} - {edge.pointer} - {edge.id_target} - {target_lemma}")
 
     # Other relationships
     print("\nOTHER RELATIONS:")
     for edge in synset.outgoing_edges(BabelPointer.OTHER):
-        target_synset = bn.get_synset(edge.id_target)
-        target_main = target_synset.main_sense(Language.EN)
-        target_lemma = target_main.full_lemma if target_main else "N/A"
+        target_lemma = get_target_lemma(edge.id_target.id)
         print(f"{synset.id} - {edge.pointer} - {edge.id_target} - {target_lemma}")
 
     print()
@@ -1,27 +1,50 @@
+import logging
+import os
 import babelnet as bn
 from babelnet import BabelSynsetID, Language
 from babelnet.data.relation import BabelPointer
 from tqdm import tqdm
-from collections import deque # More efficient for queue operations
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------
 # Helper functions
 # ---------------------------------------------------
 
+# Concurrent BabelNet requests during traversal; keep small to respect rate limits
+MAX_WORKERS = 8
+
 # Cache for synset objects and their lemmas to avoid redundant lookups
 _synset_cache = {}
 _lemma_cache = {}
+# Edge target IDs by (synset ID, pointer), so a synset object can be dropped once it is expanded
+_target_ids_cache = {}
+# Marks a synset that is not in _synset_cache (None there means BabelNet has no such synset)
+_NOT_CACHED = object()
+# Failed fetches per synset ID; a synset is only given up on (cached as None) after MAX_FETCH_ATTEMPTS,
+# so a timeout or rate-limit error doesn't drop it and its subtree for the rest of the traversal
+MAX_FETCH_ATTEMPTS = 3
+_fetch_failures = {}
 
 def get_cached_synset(synset_id_obj):
     """Retrieves a synset from cache or BabelNet, then caches it."""
     synset_id_str = synset_id_obj.id # Use the string representation for dict key
-    if synset_id_str not in _synset_cache:
+    # One read into a local: traverse_synset may evict the entry between a membership test and an index
+    synset = _synset_cache.get(synset_id_str, _NOT_CACHED)
+    if synset is _NOT_CACHED:
         try:
-            _synset_cache[synset_id_str] = bn.get_synset(synset_id_obj)
+            synset = bn.get_synset(synset_id_obj)
         except Exception as e:
-            print(f"[!] Could not retrieve synset {synset_id_str}: {type(e).__name__}: {e}")
+            failures = _fetch_failures.get(synset_id_str, 0) + 1
+            _fetch_failures[synset_id_str] = failures
+            logger.warning("Could not retrieve synset %s (attempt %d of %d): %s: %s",
+                           synset_id_str, failures, MAX_FETCH_ATTEMPTS, type(e).__name__, e)
+            if failures >= MAX_FETCH_ATTEMPTS:
+                _synset_cache[synset_id_str] = None
             return None
-    return _synset_cache[synset_id_str]
+        _synset_cache[synset_id_str] = synset
+    return synset
 
 def get_lemma(synset):
     """Retrieves lemma from cache or synset, then caches it."""
@@ -33,6 +56,25 @@ def get_lemma(synset):
         _lemma_cache[synset_id_str] = main_sense.full_lemma if main_sense else "N/A"
     return _lemma_cache[synset_id_str]
 
+def get_lemma_by_id(synset_id_obj):
+    """Retrieves lemma by synset ID, fetching the synset only if the lemma isn't cached yet."""
+    lemma = _lemma_cache.get(synset_id_obj.id)
+    if lemma is None:
+        lemma = get_lemma(get_cached_synset(synset_id_obj))
+    return lemma
+
+def get_target_ids(synset_id_obj, pointer):
+    """Retrieves the target IDs of a synset's outgoing edges of one pointer type, then caches them."""
+    key = (synset_id_obj.id, pointer)
+    target_ids = _target_ids_cache.get(key)
+    if target_ids is None:
+        synset = get_cached_synset(synset_id_obj)
+        if synset is None:
+            return ()
+        target_ids = tuple(edge.id_target for edge in synset.outgoing_edges(pointer))
+        _target_ids_cache[key] = target_ids
+    return target_ids
+
 def fetch_edges(synset, pointer, relation_type, max_items=50):
     """
     Fetch outgoing edges of a given pointer type.
@@ -42,20 +84,18 @@ def fetch_edges(synset, pointer, relation_type, max_items=50):
         return items
 
     try:
-        edges = synset.outgoing_edges(pointer)
-        for edge in edges:
-            target_synset = get_cached_synset(edge.id_target)
-            lemma = get_lemma(target_synset)
+        for target_id in get_target_ids(synset.id, pointer):
+            lemma = get_lemma_by_id(target_id)
             if lemma != "N/A":
                 items.append({
-                    "id": edge.id_target.id,
+                    "id": target_id.id,
                     "lemma": lemma,
                     "relation": relation_type
                 })
             if len(items) >= max_items:
                 break
     except Exception as e:
-        print(f"[!] Error fetching {relation_type} for {synset.id}: {type(e).__name__}: {e}")
+        logger.warning("Error fetching %s for %s: %s: %s", relation_type, synset.id, type(e).__name__, e)
     return items
 
 def fetch_hypernyms(synset, max_items=50):
@@ -76,12 +116,12 @@ def fetch_meronyms(synset, max_items=50):
 
     try:
         for pointer in meronym_pointers:
-            edges = fetch_edges(synset, pointer=pointer, relation_type="meronym", max_items=max_items)
+            edges = fetch_edges(synset, pointer=pointer, relation_type="meronym", max_items=max_items - len(items))
             items.extend(edges)
             if len(items) >= max_items:
                 break
     except Exception as e:
-        print(f"[!] Error fetching meronyms for {synset.id}: {type(e).__name__}: {e}")
+        logger.warning("Error fetching meronyms for %s: %s: %s", synset.id, type(e).__name__, e)
     return items[:max_items]
 
 def get_cohyponyms(synset, max_items=50):
@@ -96,20 +136,15 @@ def get_cohyponyms(synset, max_items=50):
         return cohyponyms
 
     try:
-        hypernym_edges = synset.outgoing_edges(BabelPointer.ANY_HYPERNYM)
-        for hypernym_edge in hypernym_edges:
-            hypernym_synset = get_cached_synset(hypernym_edge.id_target)
-            if hypernym_synset is None:
-                continue
-
-            hyponym_edges = hypernym_synset.outgoing_edges(BabelPointer.ANY_HYPONYM)
-            for hyponym_edge in hyponym_edges:
-                if hyponym_edge.id_target.id != synset.id.id:
-                    target_synset = get_cached_synset(hyponym_edge.id_target)
-                    lemma = get_lemma(target_synset)
+        synset_id_str = synset.id.id
+        for hypernym_id in get_target_ids(synset.id, BabelPointer.ANY_HYPERNYM):
+            # Hyponym IDs outlive the hypernym's synset object, which is dropped once expanded
+            for target_id in get_target_ids(hypernym_id, BabelPointer.ANY_HYPONYM):
+                if target_id.id != synset_id_str:
+                    lemma = get_lemma_by_id(target_id)
                     if lemma != "N/A":
                         cohyponyms.append({
-                            "id": hyponym_edge.id_target.id,
+                            "id": target_id.id,
                             "lemma": lemma,
                             "relation": "cohyponym"
                         })
@@ -118,60 +153,77 @@ def get_cohyponyms(synset, max_items=50):
             if len(cohyponyms) >= max_items:
                 break
     except Exception as e:
-        print(f"[!] Error fetching cohyponyms for {synset.id}: {type(e).__name__}: {e}")
+        logger.warning("Error fetching cohyponyms for %s: %s: %s", synset.id, type(e).__name__, e)
     return cohyponyms
 
 # ---------------------------------------------------
 # Recursive traversal
 # ---------------------------------------------------
 
-def traverse_synset(synset_id, max_depth, visited, max_items):
+def expand_synset(synset_id, expand, max_items):
     """
-    Recursively traverse all relations of a synset up to max_depth.
+    Fetch a synset, its lemma and (if expand) its relations. Runs in worker threads.
     """
-    # Using deque for efficient append and pop from both ends (BFS behavior)
-    queue = deque([(synset_id, 0)])
+    synset = get_cached_synset(BabelSynsetID(synset_id))
+    if synset is None:
+        return None, "N/A", []
 
-    pbar = tqdm(desc=f"⤵ Traversing from root {synset_id[:8]}...", unit="synset", position=1, leave=False)
+    lemma = get_lemma(synset)
+    relations = []
+    if expand:
+        relations.extend(fetch_hypernyms(synset, max_items=max_items))
+        relations.extend(fetch_hyponyms(synset, max_items=max_items))
+        relations.extend(fetch_meronyms(synset, max_items=max_items))
+        relations.extend(get_cohyponyms(synset, max_items=max_items))
+    return synset, lemma, relations
 
-    while queue:
-        current_id, current_depth = queue.popleft() # Use popleft for BFS
 
-        if current_id in visited:
-            pbar.update(1) # Still update progress for skipped items
-            continue
+def traverse_synset(synset_id, max_depth, visited, max_items, executor):
+    """
+    Recursively traverse all relations of a synset up to max_depth.
 
-        synset = get_cached_synset(BabelSynsetID(current_id))
-        if synset is None:
-            pbar.update(1)
-            continue
+    BFS one level at a time: the synsets of a level are fetched concurrently,
+    then merged in queue order, so the discovery order matches a serial BFS.
+    """
+    frontier = [synset_id]
+    depth = 0
 
-        lemma = get_lemma(synset)
-        visited[current_id] = lemma
-        print(f"[+] Discovered synset {current_id} → {lemma}")
+    pbar = tqdm(desc=f"⤵ Traversing from root {synset_id[:8]}...", unit="synset", position=1, leave=False)
+
+    while frontier:
+        level = [sid for sid in dict.fromkeys(frontier) if sid not in visited]
+        pbar.update(len(frontier) - len(level)) # Still update progress for skipped items
+        results = executor.map(lambda sid: expand_synset(sid, depth < max_depth, max_items), level)
 
-        if current_depth >= max_depth:
+        next_frontier = []
+        for current_id, (synset, lemma, relations) in zip(level, results):
             pbar.update(1)
-            continue
+            if synset is None:
+                continue
+
+            visited[current_id] = lemma
+            logger.debug("Discovered synset %s → %s", current_id, lemma)
 
-        all_relations = []
-        all_relations.extend(fetch_hypernyms(synset, max_items=max_items))
-        all_relations.extend(fetch_hyponyms(synset, max_items=max_items))
-        all_relations.extend(fetch_meronyms(synset, max_items=max_items))
-        all_relations.extend(get_cohyponyms(synset, max_items=max_items))
+            for relation in relations:
+                rel_id = relation["id"]
+                rel_lemma = relation["lemma"]
+                rel_type = relation["relation"]
 
-        for relation in all_relations:
-            rel_id = relation["id"]
-            rel_lemma = relation["lemma"]
-            rel_type = relation["relation"]
+                # log newly discovered word
+                logger.debug("    %s: %s → %s", rel_type.upper(), rel_id, rel_lemma)
 
-            # print newly discovered word
-            print(f"    [→] {rel_type.upper()}: {rel_id} → {rel_lemma}")
+                if rel_id not in visited:
+                    next_frontier.append(rel_id)
 
-            if rel_id not in visited:
-                queue.append((rel_id, current_depth + 1))
+        # Evict only once the whole level is done, as its other workers may still read these synsets.
+        # An expanded synset's lemma and edge targets are cached, so its full object is no longer
+        # needed; unexpanded ones (at max_depth) stay, as cohyponym lookups may still need their hyponyms.
+        for current_id in level:
+            if (current_id, BabelPointer.ANY_HYPONYM) in _target_ids_cache:
+                _synset_cache.pop(current_id, None)
 
-        pbar.update(1)
+        frontier = next_frontier
+        depth += 1
 
     pbar.close()
 
@@ -186,7 +238,9 @@ def process_file(input_file, output_file, max_depth=4, max_items=50):
     with open(input_file, "r", encoding="utf-8") as infile:
         synset_ids = [line.strip().split("\t")[0] for line in infile if line.strip()]
 
-    with tqdm(total=len(synset_ids), desc="🔍 Processing root synsets", unit="root") as main_bar:
+    # BabelNet lookups are I/O-bound, so a level's synsets are fetched in parallel threads
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor, \
+            tqdm(total=len(synset_ids), desc="🔍 Processing root synsets", unit="root") as main_bar:
         for synset_id in synset_ids:
             # Clear caches for each root synset if memory is an issue,
             # otherwise keep them to benefit from inter-root overlaps.
@@ -195,7 +249,7 @@ def process_file(input_file, output_file, max_depth=4, max_items=50):
             # _synset_cache = {}
             # _lemma_cache = {}
 
-            traverse_synset(synset_id, max_depth, visited_synsets, max_items=max_items)
+            traverse_synset(synset_id, max_depth, visited_synsets, max_items=max_items, executor=executor)
             main_bar.update(1)
 
     with open(output_file, "w", encoding="utf-8") as outfile:
@@ -209,6 +263,8 @@ def process_file(input_file, output_file, max_depth=4, max_items=50):
 # ---------------------------------------------------
 
 if __name__ == "__main__":
+    # Set LOG_LEVEL=DEBUG to see every discovered synset and relation
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper())
     input_path = "../GeneratedFiles/seed_words_10.txt"
     output_path = "../GeneratedFiles/assembled_words.txt"
     max_depth = 5
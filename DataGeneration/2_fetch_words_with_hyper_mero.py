@@ -3,6 +3,7 @@ from babelnet import BabelSynsetID, Language
 from babelnet.data.relation import BabelPointer
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from functools import lru_cache
+from itertools import islice
 
 # === Caching layer ===
 
@@ -28,10 +29,11 @@ def fetch_edges(synset, pointer, relation_type, max_items=10):
         for edge in edges:
             if len(items) >= max_items:
                 break
-            lemma = get_lemma_cached(edge.id_target.id)
+            target_id = edge.id_target.id
+            lemma = get_lemma_cached(target_id)
             if lemma != "N/A":
                 items.append({
-                    "id": edge.id_target.id,
+                    "id": target_id,
                     "lemma": lemma
                 })
     except Exception as e:
@@ -53,7 +55,8 @@ def fetch_meronyms(synset, max_items=10):
     items = []
     try:
         for pointer in meronym_pointers:
-            items.extend(fetch_edges(synset, pointer=pointer, relation_type="meronym"))
+            items.extend(fetch_edges(synset, pointer=pointer, relation_type="meronym",
+                                     max_items=max_items - len(items)))
             if len(items) >= max_items:
                 break
     except Exception as e:
@@ -63,14 +66,16 @@ def fetch_meronyms(synset, max_items=10):
 def get_cohyponyms(synset, max_items=10):
     cohyponyms = []
     try:
+        synset_id = synset.id.id
         for hypernym_edge in synset.outgoing_edges(BabelPointer.ANY_HYPERNYM):
             hypernym_synset = cached_get_synset(hypernym_edge.id_target.id)
             for hyponym_edge in hypernym_synset.outgoing_edges(BabelPointer.ANY_HYPONYM):
-                if hyponym_edge.id_target.id != synset.id.id:
-                    lemma = get_lemma_cached(hyponym_edge.id_target.id)
+                target_id = hyponym_edge.id_target.id
+                if target_id != synset_id:
+                    lemma = get_lemma_cached(target_id)
                     if lemma != "N/A":
                         cohyponyms.append({
-                            "id": hyponym_edge.id_target.id,
+                            "id": target_id,
                             "lemma": lemma
                         })
                 if len(cohyponyms) >= max_items:
@@ -85,12 +90,13 @@ def get_cohyponyms(synset, max_items=10):
 
 def has_all_relations(synset, max_items=1):
     try:
-        return all([
-            bool(fetch_hypernyms(synset, max_items)),
-            bool(fetch_hyponyms(synset, max_items)),
-            bool(fetch_meronyms(synset, max_items)),
-            bool(get_cohyponyms(synset, max_items))
-        ])
+        # Chained so a missing relation skips the edge walks for the remaining ones
+        return bool(
+            fetch_hypernyms(synset, max_items)
+            and fetch_hyponyms(synset, max_items)
+            and fetch_meronyms(synset, max_items)
+            and get_cohyponyms(synset, max_items)
+        )
     except Exception as e:
         print(f"[!] Error checking relations for {synset.id}: {type(e).__name__}: {e}")
         return False
@@ -98,7 +104,7 @@ def has_all_relations(synset, max_items=1):
 # === Threaded line processor ===
 
 def process_synset_line(line, line_number):
-    synset_id = line.split("\t")[0]
+    synset_id = line.split("\t", 1)[0]
     try:
         synset = cached_get_synset(synset_id)
         if has_all_relations(synset):
@@ -113,8 +119,10 @@ def process_synset_line(line, line_number):
 # === File processor ===
 
 def process_file(input_file, output_file, max_lines=100):
+    # Stop reading at max_lines instead of scanning the rest of the file, and strip each line once
     with open(input_file, "r", encoding="utf-8") as infile:
-        lines = [line.strip() for i, line in enumerate(infile) if line.strip() and i < max_lines]
+        stripped = (line.strip() for line in islice(infile, max_lines))
+        lines = [line for line in stripped if line]
 
     results = []
     with ThreadPoolExecutor(max_workers=10) as executor:
@@ -1,29 +1,55 @@
-import json
+import logging
+import orjson
+import os
 import random
+import shelve
+import threading
 from pathlib import Path
-import babelnet as bn
 from language_config import LANGUAGE_CONFIG
-from babelnet import BabelSynsetID, Language
+from babelnet import Language
 from fetch_relatives_helper import (
     fetch_hypernyms,
     fetch_hyponyms,
     fetch_meronyms,
     get_cohyponyms,
     deduplicate,
-    get_lemma
+    cached_get_synset,
+    cached_lemma,
+    babelnet_request,
+    persistent_relation_cache
 )
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from tqdm import tqdm
 
+logger = logging.getLogger(__name__)
+
 # Path to your file with 500 BabelNet IDs
 BABELNET_IDS_FILE = "../GeneratedFiles/babelnet_with_relations.txt"
 
 # Process all synsets in the file (set to None to process all)
 NUM_SYNSETS = None
 
+# Synsets processed in parallel threads; BabelNet requests from all of them (and from the translation
+# and prefetch pools) share the helper's MAX_CONCURRENT_REQUESTS cap, which respects rate limits
+MAX_WORKERS = 8
+
+# Synsets submitted ahead of the writer; bounds how many finished entries wait in memory
+MAX_PENDING = MAX_WORKERS * 4
+
 # Output file
 OUTPUT_JSON = "../GeneratedFiles/JsonFiles/multilingual_babelnet_relations.json"
 
+# On-disk cache of per-synset translations, so reruns don't query BabelNet again.
+# Bump TRANSLATION_CACHE_VERSION after switching BabelNet versions or the language list.
+TRANSLATION_CACHE_FILE = "../GeneratedFiles/translation_cache"
+TRANSLATION_CACHE_VERSION = "1"
+
+# On-disk cache of edge targets and English lemmas (versioned by RELATION_CACHE_VERSION in the helper)
+RELATION_CACHE_FILE = "../GeneratedFiles/relation_cache"
+
 # Gather all languages for multilingual translations
 ALL_LANGUAGES = {
     **LANGUAGE_CONFIG['high_resource'],
@@ -34,7 +60,8 @@ ALL_LANGUAGES = {
 
 def load_babelnet_ids(path):
     with open(path, "r", encoding="utf-8") as f:
-        ids = [line.strip() for line in f if line.strip()]
+        # One bulk read, with each line stripped once
+        ids = [line for line in map(str.strip, f.read().splitlines()) if line]
     return ids
 
 
@@ -47,7 +74,8 @@ def get_glossary_and_examples(synset):
     SOURCE_PRIORITY = ['wn', 'wn2020']
 
     try:
-        glosses = [g for g in synset.glosses() if g.language == Language.EN]
+        with babelnet_request():
+            glosses = [g for g in synset.glosses() if g.language == Language.EN]
         if glosses:
             # Group glosses by source
             gloss_by_source = {str(getattr(g, 'source', 'Unknown')).lower(): g for g in glosses}
@@ -64,7 +92,7 @@ def get_glossary_and_examples(synset):
 
             if chosen_gloss:
                 source_str = str(getattr(chosen_gloss, 'source', 'Unknown'))
-                print(f"Glossary: {chosen_gloss.gloss} | Source: {source_str}")
+                logger.debug("Glossary: %s | Source: %s", chosen_gloss.gloss, source_str)
                 glossary_data['en'] = {
                     'text': chosen_gloss.gloss,
                     'language': chosen_gloss.language.name,
@@ -72,10 +100,11 @@ def get_glossary_and_examples(synset):
                 }
 
     except Exception as e:
-        print(f"[DEBUG] Error fetching glosses: {e}")
+        logger.debug("Error fetching glosses: %s", e)
 
     try:
-        examples = [ex for ex in synset.examples() if ex.language == Language.EN]
+        with babelnet_request():
+            examples = [ex for ex in synset.examples() if ex.language == Language.EN]
         if examples:
             # Group examples by source
             examples_by_source = {}
@@ -94,7 +123,7 @@ def get_glossary_and_examples(synset):
             if chosen_examples:
                 for ex in chosen_examples:
                     source_str = str(getattr(ex, 'source', 'Unknown'))
-                    print(f"Example: {ex.example} | Source: {source_str}")
+                    logger.debug("Example: %s | Source: %s", ex.example, source_str)
                     examples_data.setdefault('en', []).append({
                         'text': ex.example,
                         'language': ex.language.name,
@@ -102,7 +131,7 @@ def get_glossary_and_examples(synset):
                     })
 
     except Exception as e:
-        print(f"[DEBUG] Error fetching examples: {e}")
+        logger.debug("Error fetching examples: %s", e)
 
     return glossary_data, examples_data
 
@@ -110,12 +139,14 @@ def get_glossary_and_examples(synset):
 
 def fetch_synset_relations(synset_id_str, max_items=10):
     try:
-        synset = bn.get_synset(BabelSynsetID(synset_id_str))
-    except Exception as e:
-        print(f"[!] Failed to retrieve synset {synset_id_str}: {type(e).__name__}: {e}")
+        synset = cached_get_synset(synset_id_str)
+    except Exception:
+        logger.exception("Failed to retrieve synset %s", synset_id_str)
         return None
 
-    lemma = get_lemma(synset)
+    # Main synset translations; the English lemma comes from the same main_sense pass
+    translations = get_cached_translations(synset_id_str)
+    lemma = translations.get("en", {}).get("lemma", "N/A")
 
     # Raw relations
     hypernyms = deduplicate(fetch_hypernyms(synset, max_items))
@@ -123,14 +154,10 @@ def fetch_synset_relations(synset_id_str, max_items=10):
     meronyms = deduplicate(fetch_meronyms(synset, max_items))
     cohyponyms = deduplicate(get_cohyponyms(synset, max_items))
 
-    # Enrich relations with translations
-    hypernyms = enrich_with_translations(hypernyms)
-    hyponyms = enrich_with_translations(hyponyms)
-    meronyms = enrich_with_translations(meronyms)
-    cohyponyms = enrich_with_translations(cohyponyms)
-
-    # Main synset translations
-    translations = get_multilingual_translations(synset, ALL_LANGUAGES)
+    # Enrich relations with translations (one concurrent batch for all four)
+    hypernyms, hyponyms, meronyms, cohyponyms = enrich_with_translations(
+        hypernyms, hyponyms, meronyms, cohyponyms
+    )
 
     # Get glossary and examples
     glossary, examples = get_glossary_and_examples(synset)
@@ -151,43 +178,117 @@ def fetch_synset_relations(synset_id_str, max_items=10):
 
 
 def get_multilingual_translations(synset, target_languages=None):
-    """Get translations for a synset in multiple languages."""
+    """Get translations for a synset in multiple languages.
+
+    Returns (translations, complete); complete is False when a lookup failed, as
+    opposed to the language having no lemma, so the result may be missing languages.
+    """
     if target_languages is None:
-        target_languages = ALL_LANGUAGES.keys()
+        target_languages = ALL_LANGUAGES
 
+    # Only probe languages the synset has senses in (known locally); main_sense is None for the rest
+    available_languages = synset.languages
     translations = {}
+    complete = True
     for lang in target_languages:
+        if lang not in available_languages:
+            continue
         try:
-            sense = synset.main_sense(lang)
-            if sense:
-                translations[ALL_LANGUAGES[lang]['code']] = {
-                    'lemma': sense.full_lemma,
-                    'language_name': ALL_LANGUAGES[lang]['name']
-                }
+            if lang == Language.EN:
+                # Reuses the English probe cached when this synset's edge was walked
+                lemma = cached_lemma(synset.id.id)
+            else:
+                with babelnet_request():
+                    sense = synset.main_sense(lang)
+                lemma = sense.full_lemma if sense else "N/A"
         except Exception as e:
-            print(f"[DEBUG] No translation available for {lang}: {e}")
-
+            logger.debug("Could not fetch translation for %s: %s", lang, e)
+            complete = False
+            continue
+        if lemma != "N/A":
+            lang_info = ALL_LANGUAGES[lang]
+            translations[lang_info['code']] = {
+                'lemma': lemma,
+                'language_name': lang_info['name']
+            }
+
+    return translations, complete
+
+
+# In-memory by default; main() swaps in the shelve-backed cache for the duration of a run
+_translation_cache = {}
+_translation_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=50_000)
+def get_cached_translations(synset_id_str):
+    """Get all-language translations for a synset ID, reading and filling the translation cache.
+
+    Common parents (e.g. "animal", "entity") recur across many synsets, so an
+    in-memory memo sits in front of the shelf to skip its disk read and unpickle.
+    Results with a failed lookup are used for this run but not cached, so a
+    transient error doesn't become a permanently missing language.
+    """
+    key = f"{TRANSLATION_CACHE_VERSION}:{synset_id_str}"
+    with _translation_cache_lock:
+        translations = _translation_cache.get(key)
+    if translations is None:
+        translations, complete = get_multilingual_translations(cached_get_synset(synset_id_str), ALL_LANGUAGES)
+        if complete:
+            with _translation_cache_lock:
+                _translation_cache[key] = translations
+        else:
+            logger.warning("Incomplete translations for %s, not caching them", synset_id_str)
     return translations
 
 
-def enrich_with_translations(items):
-    """For each item (synset reference), fetch its translations."""
-    enriched = []
-    for item in items:
-        try:
-            synset = bn.get_synset(BabelSynsetID(item['id']))
-            translations = get_multilingual_translations(synset, ALL_LANGUAGES)
-            enriched.append({
-                "id": item["id"],
-                "lemma": item["lemma"],
-                "translations": translations
-            })
-        except Exception as e:
-            print(f"[!] Failed to fetch translations for {item['id']}: {type(e).__name__}: {e}")
-    return enriched
+# Kept apart from main()'s per-synset pool, so synset workers waiting on item lookups can't starve them
+_translation_pool = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+
+
+def get_translations_or_none(synset_id_str):
+    try:
+        return get_cached_translations(synset_id_str)
+    except Exception:
+        logger.exception("Failed to fetch translations for %s", synset_id_str)
+        return None
+
+
+def enrich_with_translations(*relations):
+    """For each item (synset reference) of each relation list, fetch its translations.
+
+    The lookups for all lists run concurrently, once per distinct synset (a synset can be,
+    say, both a hyponym and a co-hyponym); one enriched list is returned per input list.
+    """
+    unique_ids = list(dict.fromkeys(item.id for items in relations for item in items))
+    translations_by_id = dict(zip(unique_ids, _translation_pool.map(get_translations_or_none, unique_ids)))
+    return [
+        [
+            {
+                "id": item.id,
+                "lemma": item.lemma,
+                "translations": translations_by_id[item.id]
+            }
+            for item in items if translations_by_id[item.id] is not None
+        ]
+        for items in relations
+    ]
+
+
+def iter_synset_relations(executor, synset_ids, max_items=10):
+    """Yield fetch_synset_relations results in input order, with at most MAX_PENDING synsets in flight."""
+    pending = deque()
+    for synset_id in synset_ids:
+        if len(pending) >= MAX_PENDING:
+            yield pending.popleft().result()
+        pending.append(executor.submit(fetch_synset_relations, synset_id, max_items))
+    while pending:
+        yield pending.popleft().result()
 
 
 def main():
+    global _translation_cache
+
     all_ids = load_babelnet_ids(BABELNET_IDS_FILE)
 
     # Process all synsets if NUM_SYNSETS is None, otherwise sample
@@ -200,31 +301,45 @@ def main():
 
     start_time = time.time()
 
-    dataset = []
-    for synset_id in tqdm(synsets_to_process, desc="Processing synsets", unit="synset"):
-        data = fetch_synset_relations(synset_id, max_items=5)
-        if data:
-            dataset.append(data)
+    # BabelNet lookups are I/O-bound, so threads overlap the round trips while this thread writes,
+    # in input order, whatever has finished.
+    # Each synset is written out as soon as it is ready (same layout as json.dump(indent=2)),
+    # so the dataset is never held in memory and partial progress is visible on disk.
+    num_synsets = glossary_count = examples_count = both_count = 0
+    with shelve.open(TRANSLATION_CACHE_FILE) as translation_cache, \
+            persistent_relation_cache(RELATION_CACHE_FILE), \
+            open(OUTPUT_JSON, "wb") as f:
+        _translation_cache = translation_cache
+        f.write(b"[")
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            results = iter_synset_relations(executor, synsets_to_process, max_items=5)
+            for data in tqdm(results, total=len(synsets_to_process), desc="Processing synsets", unit="synset"):
+                if not data:
+                    continue
+                f.write(b",\n  " if num_synsets else b"\n  ")
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  "))
+
+                num_synsets += 1
+                glossary_count += bool(data.get('glossary'))
+                examples_count += bool(data.get('examples'))
+                both_count += bool(data.get('glossary') and data.get('examples'))
+        f.write(b"\n]" if num_synsets else b"]")
+    _translation_cache = {}
 
     elapsed = time.time() - start_time
     print(f"\n⏱️ Completed in {elapsed:.2f} seconds.")
 
-    with open(OUTPUT_JSON, "w", encoding="utf-8") as f:
-        json.dump(dataset, f, ensure_ascii=False, indent=2)
-
     print(f"\n✅ Done. Dataset saved to: {OUTPUT_JSON}")
 
     # Print some statistics
-    glossary_count = sum(1 for item in dataset if item.get('glossary'))
-    examples_count = sum(1 for item in dataset if item.get('examples'))
-    both_count = sum(1 for item in dataset if item.get('glossary') and item.get('examples'))
-
     print(f"📊 Statistics:")
-    print(f"   - Total synsets processed: {len(dataset)}")
+    print(f"   - Total synsets processed: {num_synsets}")
     print(f"   - Synsets with glossary: {glossary_count}")
     print(f"   - Synsets with examples: {examples_count}")
     print(f"   - Synsets with both glossary and examples: {both_count}")
 
 
 if __name__ == "__main__":
+    # Set LOG_LEVEL=DEBUG to see per-synset glosses, examples and missing translations
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper())
     main()
\ No newline at end of file
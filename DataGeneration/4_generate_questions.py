@@ -1,18 +1,35 @@
-import json
+import orjson
 import random
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from dataclasses import dataclass
-from typing import Dict, List, Set, Tuple, Optional
+from typing import Dict, FrozenSet, Iterator, List, Set, Tuple, Optional
 from enum import Enum
 from language_config import LANGUAGE_CONFIG
-from tqdm import tqdm
 import logging
 
 # Configure logging - reduced to WARNING level
 logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
 
+# Flat lookup tables so language helpers don't rescan LANGUAGE_CONFIG per question
+_CODE_TO_NAME = {v["code"]: v["name"] for langs in LANGUAGE_CONFIG.values() for v in langs.values()}
+_CODE_TO_LEVEL = {v["code"]: level for level, langs in LANGUAGE_CONFIG.items() for v in langs.values()}
+_LANGS_BY_LEVEL = {level: [v["code"] for v in langs.values()] for level, langs in LANGUAGE_CONFIG.items()}
+
+# Templates for the "template" prompt style, built once rather than per question
+_PROMPT_TEMPLATES = {
+    "monolingual": "Select the {relation} of \"{word}\":",
+    "crosslingual": "Given the {from_lang} word \"{word}\", select its {relation} in {to_lang}:",
+    "explicit": "Which of the following {to_lang} words is a {relation} of the {from_lang} word \"{word}\"?"
+}
+
+_RELATION_NAMES = {
+    "hypernymy": "hypernym (broader category)",
+    "meronymy": "meronym (part/component)"
+}
+
 
 class DifficultyLevel(Enum):
     RANDOM_CROSS_DOMAIN = 1  # Random words from completely different synsets
@@ -55,20 +72,44 @@ class Question:
 
 class QuestionGenerator:
     def __init__(self, data: List[Dict], min_distractors: int = 3, n_choices: int = 4,
-                 prompt_style: str = "instructional"):
+                 prompt_style: str = "instructional", seed: Optional[int] = None):
         self.data = data
         self.min_distractors = min_distractors
         self.n_choices = n_choices
         self.prompt_style = prompt_style
+        self._rng = random.Random(seed)
         self.synset_lookup = self._build_synset_lookup()
         self.lemma_lookup, self.semantic_relations = self._build_lemma_lookup()
+        # Tuples are sampled directly, so no set is copied into a list per question
+        self._lemma_tuples = {lang: tuple(lemmas) for lang, lemmas in self.lemma_lookup.items()}
         self.synset_to_entry = {entry.get("synset_id"): entry for entry in data if entry.get("synset_id")}
+        self._entries_by_hypernym = self._build_hypernym_index()
+        # id(entry) -> exclusion set; an entry recurs across target languages and difficulty levels
+        self._exclusion_sets: Dict[int, FrozenSet[str]] = {}
+
+    def _build_hypernym_index(self) -> Dict[str, List[int]]:
+        """Map each hypernym synset ID to the positions in data of the entries listing it."""
+        entries_by_hypernym = defaultdict(list)
+        for position, entry in enumerate(self.data):
+            for hypernym_entry in entry.get("hypernyms", []):
+                positions = entries_by_hypernym[hypernym_entry.get("synset_id")]
+                if not positions or positions[-1] != position:
+                    positions.append(position)
+        return dict(entries_by_hypernym)
+
+    def _entries_sharing_hypernyms(self, hypernym_ids: Set[str]) -> Iterator[Dict]:
+        """Yield, in data order, the entries that list any of the given hypernyms."""
+        positions = set()
+        for hypernym_id in hypernym_ids:
+            positions.update(self._entries_by_hypernym.get(hypernym_id, ()))
+        for position in sorted(positions):
+            yield self.data[position]
 
     def _build_synset_lookup(self) -> Dict[str, Dict]:
         """Build lookup table for synsets."""
         return {entry.get("synset_id"): entry for entry in self.data if entry.get("synset_id")}
 
-    def _build_lemma_lookup(self) -> Tuple[Dict[str, Set[str]], Dict[str, Dict[str, Set[str]]]]:
+    def _build_lemma_lookup(self) -> Tuple[Dict[str, FrozenSet[str]], Dict[str, Dict[str, FrozenSet[str]]]]:
         """Build lookup tables for lemmas and semantic relations."""
         lemma_lookup = defaultdict(set)
         semantic_relations = defaultdict(lambda: defaultdict(set))
@@ -85,21 +126,21 @@ class QuestionGenerator:
                         lemma_lookup[lang_code].add(trans["lemma"])
                         semantic_relations[lang_code][rel_type].add(trans["lemma"])
 
-        return lemma_lookup, semantic_relations
+        return (
+            {lang: frozenset(lemmas) for lang, lemmas in lemma_lookup.items()},
+            {lang: {rel_type: frozenset(lemmas) for rel_type, lemmas in relations.items()}
+             for lang, relations in semantic_relations.items()}
+        )
 
     @staticmethod
     def _get_lang_info(lang_code: str) -> Tuple[Optional[str], Optional[str]]:
         """Get language name and resource level for a language code."""
-        for level, langs in LANGUAGE_CONFIG.items():
-            for lang, v in langs.items():
-                if v["code"] == lang_code:
-                    return v["name"], level
-        return None, None
+        return _CODE_TO_NAME.get(lang_code), _CODE_TO_LEVEL.get(lang_code)
 
     @staticmethod
     def _get_languages_by_resource(resource_level: str) -> List[str]:
         """Get all language codes for a given resource level."""
-        return [v["code"] for v in LANGUAGE_CONFIG[resource_level].values()]
+        return list(_LANGS_BY_LEVEL[resource_level])
 
     def _get_language_pairs(self, mode: MultilingualMode) -> Tuple[List[str], List[str]]:
         """Get source and target languages based on multilingual mode."""
@@ -162,19 +203,23 @@ class QuestionGenerator:
                 our_hypernyms.add(hypernym_synset_id)
 
         # Find other synsets that share these hypernyms
-        for other_entry in self.data:
+        for other_entry in self._entries_sharing_hypernyms(our_hypernyms):
             if other_entry.get("synset_id") == entry.get("synset_id"):
                 continue  # Skip self
 
-            for other_hypernym in other_entry.get("hypernyms", []):
-                other_hypernym_id = other_hypernym.get("synset_id")
-                if other_hypernym_id in our_hypernyms:
-                    # This synset shares a hypernym with us
-                    if target_lang in other_entry.get("translations", {}):
-                        shared_hypernym_words.add(other_entry["translations"][target_lang]["lemma"])
+            if target_lang in other_entry.get("translations", {}):
+                shared_hypernym_words.add(other_entry["translations"][target_lang]["lemma"])
 
         return shared_hypernym_words
 
+    def _get_semantic_exclusion_set(self, entry: Dict) -> FrozenSet[str]:
+        """Get the exclusion set for an entry, building it on first use."""
+        excluded_synsets = self._exclusion_sets.get(id(entry))
+        if excluded_synsets is None:
+            excluded_synsets = frozenset(self._build_semantic_exclusion_set(entry))
+            self._exclusion_sets[id(entry)] = excluded_synsets
+        return excluded_synsets
+
     def _build_semantic_exclusion_set(self, entry: Dict) -> Set[str]:
         """Build comprehensive set of all semantically related synset IDs to exclude."""
         excluded_synsets = set()
@@ -198,15 +243,10 @@ class QuestionGenerator:
             our_hypernyms.add(hypernym_entry.get("synset_id"))
 
         # Find synsets sharing these hypernyms
-        for other_entry in self.data:
+        for other_entry in self._entries_sharing_hypernyms(our_hypernyms):
             other_synset_id = other_entry.get("synset_id")
-            if other_synset_id == current_synset_id:
-                continue
-
-            for other_hypernym in other_entry.get("hypernyms", []):
-                if other_hypernym.get("synset_id") in our_hypernyms:
-                    excluded_synsets.add(other_synset_id)
-                    break
+            if other_synset_id != current_synset_id:
+                excluded_synsets.add(other_synset_id)
 
         return excluded_synsets
 
@@ -248,10 +288,14 @@ class QuestionGenerator:
 
     def _get_cross_domain_words(self, entry: Dict, target_lang: str, sample_size: int = 50) -> Set[str]:
         """Get words from completely different semantic domains with comprehensive exclusion."""
-        # Build comprehensive exclusion set
-        excluded_synsets = self._build_semantic_exclusion_set(entry)
+        # Comprehensive exclusion set (built once per entry)
+        excluded_synsets = self._get_semantic_exclusion_set(entry)
 
         # Find truly cross-domain candidates
+        # The target's lemma is lowercased once, not once per candidate
+        target_translation = entry.get("translations", {}).get(target_lang)
+        target_lemma = target_translation["lemma"].lower() if target_translation else None
+
         candidate_words = []
         for other_entry in self.data:
             other_synset_id = other_entry.get("synset_id")
@@ -260,30 +304,30 @@ class QuestionGenerator:
             if other_synset_id in excluded_synsets:
                 continue
 
+            # Only synsets with a lemma in the target language can be candidates
+            other_translation = other_entry.get("translations", {}).get(target_lang)
+            if other_translation is None:
+                continue
+            candidate_lemma = other_translation["lemma"]
+
             # Additional check: ensure no shared vocabulary
-            if self._shares_vocabulary_with_target(entry, other_entry, target_lang):
+            if target_lemma is not None and self._shares_vocabulary(target_lemma, candidate_lemma.lower()):
                 continue
 
             # This synset appears to be truly cross-domain
-            if target_lang in other_entry.get("translations", {}):
-                candidate_words.append(other_entry["translations"][target_lang]["lemma"])
+            candidate_words.append(candidate_lemma)
 
         # Sample to avoid memory issues and ensure diversity
         if len(candidate_words) > sample_size:
-            cross_domain_words = set(random.sample(candidate_words, sample_size))
+            cross_domain_words = set(self._rng.sample(candidate_words, sample_size))
         else:
             cross_domain_words = set(candidate_words)
 
         return cross_domain_words
 
-    def _shares_vocabulary_with_target(self, target_entry: Dict, candidate_entry: Dict, lang: str) -> bool:
-        """Check if candidate synset shares vocabulary/lemmas with target synset's semantic field."""
-        if lang not in target_entry.get("translations", {}) or lang not in candidate_entry.get("translations", {}):
-            return False
-
-        target_lemma = target_entry["translations"][lang]["lemma"].lower()
-        candidate_lemma = candidate_entry["translations"][lang]["lemma"].lower()
-
+    @staticmethod
+    def _shares_vocabulary(target_lemma: str, candidate_lemma: str) -> bool:
+        """Check if a candidate lemma shares vocabulary with the target lemma (both lowercased)."""
         # Check for substring relationships (e.g., "dog" in "bulldog")
         if target_lemma in candidate_lemma or candidate_lemma in target_lemma:
             return True
@@ -295,7 +339,7 @@ class QuestionGenerator:
 
         return False
 
-    def _generate_distractors(self, correct_lemma: str, all_candidates: Set[str],
+    def _generate_distractors(self, correct_lemma: str, all_candidates: Tuple[str, ...],
                               target_lang: str, entry: Dict, difficulty: DifficultyLevel) -> Tuple[List[str], str]:
         """Generate distractors based on semantic hierarchy difficulty levels."""
 
@@ -313,43 +357,43 @@ class QuestionGenerator:
             # Fallback to random
             return self._random_cross_domain_distractors(correct_lemma, all_candidates, target_lang, entry)
 
-    def _random_cross_domain_distractors(self, correct_lemma: str, all_candidates: Set[str],
+    def _random_cross_domain_distractors(self, correct_lemma: str, all_candidates: Tuple[str, ...],
                                          target_lang: str, entry: Dict) -> Tuple[List[str], str]:
         """Level 1: Random words from completely different semantic domains."""
         cross_domain_words = self._get_cross_domain_words(entry, target_lang)
 
         if len(cross_domain_words) >= self.n_choices - 1:
-            distractors = set(random.sample(list(cross_domain_words), self.n_choices - 1))
+            distractors = set(self._rng.sample(list(cross_domain_words), self.n_choices - 1))
         else:
             # Fallback to any random words if not enough cross-domain words
             remaining_needed = self.n_choices - 1 - len(cross_domain_words)
-            additional = set(random.sample(list(all_candidates),
-                                           min(remaining_needed, len(all_candidates))))
+            additional = set(self._rng.sample(all_candidates,
+                                              min(remaining_needed, len(all_candidates))))
             distractors = cross_domain_words | additional
 
         return self._finalize_distractors(distractors, correct_lemma, all_candidates), "cross_domain_random"
 
-    def _distant_hypernym_distractors(self, correct_lemma: str, all_candidates: Set[str],
+    def _distant_hypernym_distractors(self, correct_lemma: str, all_candidates: Tuple[str, ...],
                                       target_lang: str, entry: Dict) -> Tuple[List[str], str]:
         """Level 2: Words from hypernyms of hypernyms (grandfather concepts)."""
         distant_hypernyms = self._get_distant_hypernyms(entry, target_lang)
 
         if len(distant_hypernyms) >= self.n_choices - 1:
-            distractors = set(random.sample(list(distant_hypernyms), self.n_choices - 1))
+            distractors = set(self._rng.sample(list(distant_hypernyms), self.n_choices - 1))
         else:
             # Add some cross-domain words to fill gaps
             cross_domain = self._get_cross_domain_words(entry, target_lang, 20)
             available = distant_hypernyms | cross_domain
             if len(available) >= self.n_choices - 1:
-                distractors = set(random.sample(list(available), self.n_choices - 1))
+                distractors = set(self._rng.sample(list(available), self.n_choices - 1))
             else:
                 remaining = self.n_choices - 1 - len(available)
-                additional = set(random.sample(list(all_candidates), min(remaining, len(all_candidates))))
+                additional = set(self._rng.sample(all_candidates, min(remaining, len(all_candidates))))
                 distractors = available | additional
 
         return self._finalize_distractors(distractors, correct_lemma, all_candidates), "distant_hypernyms"
 
-    def _direct_relation_distractors(self, correct_lemma: str, all_candidates: Set[str],
+    def _direct_relation_distractors(self, correct_lemma: str, all_candidates: Tuple[str, ...],
                                      target_lang: str, entry: Dict) -> Tuple[List[str], str]:
         """Level 3: Direct hypernyms or hyponyms of the target."""
         direct_relations = set()
@@ -365,21 +409,21 @@ class QuestionGenerator:
                 direct_relations.add(hyponym_entry["translations"][target_lang]["lemma"])
 
         if len(direct_relations) >= self.n_choices - 1:
-            distractors = set(random.sample(list(direct_relations), self.n_choices - 1))
+            distractors = set(self._rng.sample(list(direct_relations), self.n_choices - 1))
         else:
             # Add distant hypernyms to fill gaps
             distant = self._get_distant_hypernyms(entry, target_lang)
             available = direct_relations | distant
             if len(available) >= self.n_choices - 1:
-                distractors = set(random.sample(list(available), self.n_choices - 1))
+                distractors = set(self._rng.sample(list(available), self.n_choices - 1))
             else:
                 remaining = self.n_choices - 1 - len(available)
-                additional = set(random.sample(list(all_candidates), min(remaining, len(all_candidates))))
+                additional = set(self._rng.sample(all_candidates, min(remaining, len(all_candidates))))
                 distractors = available | additional
 
         return self._finalize_distractors(distractors, correct_lemma, all_candidates), "direct_relations"
 
-    def _cohyponym_distractors(self, correct_lemma: str, all_candidates: Set[str],
+    def _cohyponym_distractors(self, correct_lemma: str, all_candidates: Tuple[str, ...],
                                target_lang: str, entry: Dict) -> Tuple[List[str], str]:
         """Level 4: Sister concepts (cohyponyms) - often hardest conceptually."""
         cohyponyms = set()
@@ -390,13 +434,13 @@ class QuestionGenerator:
                 cohyponyms.add(cohyponym_entry["translations"][target_lang]["lemma"])
 
         if len(cohyponyms) >= self.n_choices - 1:
-            distractors = set(random.sample(list(cohyponyms), self.n_choices - 1))
+            distractors = set(self._rng.sample(list(cohyponyms), self.n_choices - 1))
         else:
             # Add synsets sharing hypernyms
             shared_hypernym_words = self._get_shared_hypernym_synsets(entry, target_lang)
             available = cohyponyms | shared_hypernym_words
             if len(available) >= self.n_choices - 1:
-                distractors = set(random.sample(list(available), self.n_choices - 1))
+                distractors = set(self._rng.sample(list(available), self.n_choices - 1))
             else:
                 # Add direct relations as fallback
                 direct_relations = set()
@@ -406,15 +450,15 @@ class QuestionGenerator:
 
                 available = available | direct_relations
                 if len(available) >= self.n_choices - 1:
-                    distractors = set(random.sample(list(available), self.n_choices - 1))
+                    distractors = set(self._rng.sample(list(available), self.n_choices - 1))
                 else:
                     remaining = self.n_choices - 1 - len(available)
-                    additional = set(random.sample(list(all_candidates), min(remaining, len(all_candidates))))
+                    additional = set(self._rng.sample(all_candidates, min(remaining, len(all_candidates))))
                     distractors = available | additional
 
         return self._finalize_distractors(distractors, correct_lemma, all_candidates), "cohyponyms"
 
-    def _close_relation_distractors(self, correct_lemma: str, all_candidates: Set[str],
+    def _close_relation_distractors(self, correct_lemma: str, all_candidates: Tuple[str, ...],
                                     target_lang: str, entry: Dict) -> Tuple[List[str], str]:
         """Level 5: Meronyms or synsets with shared hypernyms - very close relations."""
         close_relations = set()
@@ -429,7 +473,7 @@ class QuestionGenerator:
         close_relations = close_relations | shared_hypernym_words
 
         if len(close_relations) >= self.n_choices - 1:
-            distractors = set(random.sample(list(close_relations), self.n_choices - 1))
+            distractors = set(self._rng.sample(list(close_relations), self.n_choices - 1))
         else:
             # Add cohyponyms as fallback
             cohyponyms = set()
@@ -439,25 +483,31 @@ class QuestionGenerator:
 
             available = close_relations | cohyponyms
             if len(available) >= self.n_choices - 1:
-                distractors = set(random.sample(list(available), self.n_choices - 1))
+                distractors = set(self._rng.sample(list(available), self.n_choices - 1))
             else:
                 remaining = self.n_choices - 1 - len(available)
-                additional = set(random.sample(list(all_candidates), min(remaining, len(all_candidates))))
+                additional = set(self._rng.sample(all_candidates, min(remaining, len(all_candidates))))
                 distractors = available | additional
 
         return self._finalize_distractors(distractors, correct_lemma, all_candidates), "close_relations"
 
     def _finalize_distractors(self, distractors: Set[str], correct_lemma: str,
-                              all_candidates: Set[str]) -> List[str]:
+                              all_candidates: Tuple[str, ...]) -> List[str]:
         """Finalize distractor set by removing correct answer and filling gaps."""
         distractors.discard(correct_lemma)
 
-        while len(distractors) < (self.n_choices - 1):
-            remaining = all_candidates - distractors - {correct_lemma}
-            if remaining:
-                distractors.add(random.choice(list(remaining)))
-            else:
-                break
+        needed = self.n_choices - 1 - len(distractors)
+        if needed > 0:
+            # Drawing needed + len(excluded) distinct lemmas guarantees enough
+            # usable candidates without copying the whole vocabulary.
+            excluded = distractors | {correct_lemma}
+            for candidate in self._rng.sample(all_candidates, min(len(all_candidates), needed + len(excluded))):
+                if candidate in excluded:
+                    continue
+                distractors.add(candidate)
+                needed -= 1
+                if not needed:
+                    break
 
         return list(distractors)
 
@@ -595,30 +645,17 @@ class QuestionGenerator:
     def _create_template_prompt(self, task_type: str, from_code: str, to_code: str,
                                 prompt_word: str, from_lang_name: str, to_lang_name: str) -> Tuple[str, str]:
         """Template-based prompt for maximum consistency."""
-
-        # Base templates
-        templates = {
-            "monolingual": "Select the {relation} of \"{word}\":",
-            "crosslingual": "Given the {from_lang} word \"{word}\", select its {relation} in {to_lang}:",
-            "explicit": "Which of the following {to_lang} words is a {relation} of the {from_lang} word \"{word}\"?"
-        }
-
-        relation_names = {
-            "hypernymy": "hypernym (broader category)",
-            "meronymy": "meronym (part/component)"
-        }
-
         if from_code == to_code:
-            template = templates["monolingual"]
+            template = _PROMPT_TEMPLATES["monolingual"]
             prompt = template.format(
-                relation=relation_names[task_type],
+                relation=_RELATION_NAMES[task_type],
                 word=prompt_word
             )
         else:
-            template = templates["explicit"]  # Most explicit for cross-lingual
+            template = _PROMPT_TEMPLATES["explicit"]  # Most explicit for cross-lingual
             prompt = template.format(
                 to_lang=to_lang_name,
-                relation=relation_names[task_type],
+                relation=_RELATION_NAMES[task_type],
                 from_lang=from_lang_name,
                 word=prompt_word
             )
@@ -644,111 +681,144 @@ class QuestionGenerator:
                                target_languages: List[str]) -> Dict[str, List[Tuple]]:
         """Collect valid entries organized by language pairs."""
         valid_entries = defaultdict(list)
+        target_set = set(target_languages)
 
         for entry in self.data:
             if not entry.get(relation_field):
                 continue
 
-            for from_code in from_languages:
-                if from_code not in entry.get("translations", {}):
-                    continue
-
-                # Filter related entries with target language translations
-                related_entries = [
-                    rel_entry for rel_entry in entry.get(relation_field, [])
-                    if any(to_code in rel_entry.get("translations", {}) for to_code in target_languages)
-                ]
+            translations = entry.get("translations", {})
+            entry_from_codes = [from_code for from_code in from_languages if from_code in translations]
+            if not entry_from_codes:
+                continue
 
-                if not related_entries:
-                    continue
+            # Group related entries by target language in a single pass
+            related_by_target = defaultdict(list)
+            for rel_entry in entry[relation_field]:
+                for to_code in rel_entry.get("translations", {}):
+                    if to_code in target_set:
+                        related_by_target[to_code].append(rel_entry)
 
+            # Pairs are added source-first in from_languages x target_languages order, so the
+            # order of valid_entries (and so question ids and per-pair seeds) doesn't depend on the data
+            for from_code in entry_from_codes:
                 for to_code in target_languages:
-                    if from_code == to_code and from_code != "en":
+                    if to_code not in related_by_target or (from_code == to_code and from_code != "en"):
                         continue
-
-                    valid_related_entries = [
-                        rel_entry for rel_entry in related_entries
-                        if to_code in rel_entry.get("translations", {})
-                    ]
-
-                    if valid_related_entries:
-                        lang_pair = f"{from_code}_to_{to_code}"
-                        valid_entries[lang_pair].append((entry, valid_related_entries))
+                    valid_entries[f"{from_code}_to_{to_code}"].append((entry, related_by_target[to_code]))
 
         return valid_entries
 
     def _generate_balanced_questions(self, valid_entries: Dict, task_type: str,
                                      relation_field: str, target_questions_per_pair: int,
-                                     multilingual_mode: str) -> List[Question]:
-        """Generate balanced questions across language pairs and difficulty levels with no word repetitions."""
-        questions = []
+                                     multilingual_mode: str, workers: int = 1) -> Iterator[Question]:
+        """Yield balanced questions across language pairs and difficulty levels with no word repetitions."""
         qid = 0
         generation_time = datetime.utcnow().isoformat() + "Z"
 
+        # Every pair gets its own seed up front, so the output does not depend on the worker count
+        pair_jobs = [
+            (lang_pair, entries, task_type, relation_field, target_questions_per_pair,
+             generation_time, multilingual_mode, self._rng.getrandbits(64))
+            for lang_pair, entries in valid_entries.items()
+        ]
+
+        if workers > 1:
+            # Workers receive the jobs once through the initializer and are then sent only job indices
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_pair_worker,
+                                           initargs=(self, pair_jobs))
+            chunksize = max(1, len(pair_jobs) // (workers * 4))
+            pair_results = executor.map(_generate_pair_in_worker, range(len(pair_jobs)), chunksize=chunksize)
+        else:
+            executor = None
+            pair_results = (self._generate_pair_questions(*job) for job in pair_jobs)
+
+        try:
+            for (lang_pair, *_), pair_questions in zip(pair_jobs, pair_results):
+                for question in pair_questions:
+                    question.id = f"{task_type}_{qid}_{lang_pair}_diff{question.metadata.difficulty}"
+                    qid += 1
+                    yield question
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def _generate_pair_questions(self, lang_pair: str, entries: List[Tuple], task_type: str,
+                                 relation_field: str, target_questions_per_pair: int,
+                                 generation_time: str, multilingual_mode: str, seed: int) -> List[Question]:
+        """Generate the questions for one language pair; ids are assigned by the caller."""
+        self._rng.seed(seed)
+        pair_questions = []
+
         # Calculate questions per difficulty level
         num_difficulties = len(DifficultyLevel)
         questions_per_difficulty = target_questions_per_pair // num_difficulties
         remaining_questions = target_questions_per_pair % num_difficulties
 
-        for lang_pair, entries in valid_entries.items():
-            from_code, to_code = lang_pair.split("_to_")
-            random.shuffle(entries)
+        from_code, to_code = lang_pair.split("_to_")
+        # Entries are shuffled lazily (partial Fisher-Yates) as the loop below reaches them,
+        # so a pair with many entries but a small target only pays for the prefix it visits
+        num_shuffled = 0
 
-            # Track used source words for this language pair to prevent repetitions
-            used_source_words = set()
-            lang_pair_questions = []
+        # Resource levels depend only on the language pair, not on the question
+        resource_pair = f"{self._get_lang_info(from_code)[1]}_to_{self._get_lang_info(to_code)[1]}"
 
-            for difficulty_enum in DifficultyLevel:
-                target_for_difficulty = questions_per_difficulty
-                if difficulty_enum.value <= remaining_questions:
-                    target_for_difficulty += 1
+        # Track used source words for this language pair to prevent repetitions
+        used_source_words = set()
 
-                questions_generated = 0
-                entry_idx = 0
+        for difficulty_enum in DifficultyLevel:
+            target_for_difficulty = questions_per_difficulty
+            if difficulty_enum.value <= remaining_questions:
+                target_for_difficulty += 1
 
-                while questions_generated < target_for_difficulty and entry_idx < len(entries):
-                    entry, valid_related_entries = entries[entry_idx]
+            questions_generated = 0
+            entry_idx = 0
 
-                    # Get source word (prompt word)
-                    source_word = entry["translations"][from_code]["lemma"]
+            while questions_generated < target_for_difficulty and entry_idx < len(entries):
+                if entry_idx == num_shuffled:
+                    swap_idx = self._rng.randrange(entry_idx, len(entries))
+                    entries[entry_idx], entries[swap_idx] = entries[swap_idx], entries[entry_idx]
+                    num_shuffled += 1
 
-                    # Skip if this source word was already used in this language pair
-                    if source_word in used_source_words:
-                        entry_idx += 1
-                        continue
-
-                    # Generate question
-                    question = self._create_single_question(
-                        entry, valid_related_entries, from_code, to_code,
-                        task_type, relation_field, difficulty_enum,
-                        qid, generation_time, multilingual_mode
-                    )
+                entry, valid_related_entries = entries[entry_idx]
 
-                    if question:
-                        lang_pair_questions.append(question)
-                        used_source_words.add(source_word)
-                        qid += 1
-                        questions_generated += 1
+                # Get source word (prompt word)
+                source_word = entry["translations"][from_code]["lemma"]
 
+                # Skip if this source word was already used in this language pair
+                if source_word in used_source_words:
                     entry_idx += 1
+                    continue
+
+                # Generate question
+                question = self._create_single_question(
+                    entry, valid_related_entries, from_code, to_code,
+                    task_type, relation_field, difficulty_enum,
+                    generation_time, multilingual_mode, resource_pair
+                )
 
-            # Add all questions for this language pair
-            questions.extend(lang_pair_questions)
+                if question:
+                    pair_questions.append(question)
+                    used_source_words.add(source_word)
+                    questions_generated += 1
 
-        return questions
+                entry_idx += 1
+
+        return pair_questions
 
     def _create_single_question(self, entry: Dict, valid_related_entries: List[Dict],
                                 from_code: str, to_code: str, task_type: str,
                                 relation_field: str, difficulty: DifficultyLevel,
-                                qid: int, generation_time: str, multilingual_mode: str) -> Optional[Question]:
+                                generation_time: str, multilingual_mode: str,
+                                resource_pair: str) -> Optional[Question]:
         """Create a single question from entry data."""
         try:
             prompt_word = entry["translations"][from_code]["lemma"]
-            relation_entry = random.choice(valid_related_entries)
+            relation_entry = self._rng.choice(valid_related_entries)
             correct_lemma = relation_entry["translations"][to_code]["lemma"]
 
-            all_candidates = self.lemma_lookup[to_code] - {correct_lemma}
-            if len(all_candidates) < self.min_distractors:
+            all_candidates = self._lemma_tuples.get(to_code, ())
+            if len(all_candidates) - (correct_lemma in self.lemma_lookup.get(to_code, ())) < self.min_distractors:
                 return None
 
             distractors, distractor_type = self._generate_distractors(
@@ -756,17 +826,13 @@ class QuestionGenerator:
             )
 
             options = distractors + [correct_lemma]
-            random.shuffle(options)
+            self._rng.shuffle(options)
             answer_index = options.index(correct_lemma)
 
             prompt_text, prompt_lang_code = self._create_prompt_text(
                 task_type, from_code, to_code, prompt_word
             )
 
-            from_resource = self._get_lang_info(from_code)[1]
-            to_resource = self._get_lang_info(to_code)[1]
-            resource_pair = f"{from_resource}_to_{to_resource}"
-
             metadata = QuestionMetadata(
                 resource_pair=resource_pair,
                 prompt_lang=prompt_lang_code,
@@ -780,7 +846,7 @@ class QuestionGenerator:
             )
 
             return Question(
-                id=f"{task_type}_{qid}_{from_code}_to_{to_code}_diff{difficulty.value}",
+                id="",  # assigned in _generate_balanced_questions once the global order is known
                 prompt=prompt_text,
                 options=options,
                 answer_index=answer_index,
@@ -793,8 +859,8 @@ class QuestionGenerator:
 
     def generate_task(self, task_type: str, relation_field: str, output_filename: str,
                       multilingual_mode: MultilingualMode = MultilingualMode.ALL,
-                      target_questions_per_pair: int = 100) -> None:
-        """Generate questions for a specific task type."""
+                      target_questions_per_pair: int = 100, workers: int = 1) -> None:
+        """Generate questions for a specific task type, optionally spreading language pairs over worker processes."""
         print(f"Generating {task_type} questions ({multilingual_mode.value})...")
 
         from_languages, target_languages = self._get_language_pairs(multilingual_mode)
@@ -806,55 +872,60 @@ class QuestionGenerator:
             print(f"No valid entries found for {task_type} with mode {multilingual_mode.value}")
             return
 
-        # Generate questions
+        # Generate questions and stream them to the output file as they are produced
         questions = self._generate_balanced_questions(
             valid_entries, task_type, relation_field,
-            target_questions_per_pair, multilingual_mode.value
+            target_questions_per_pair, multilingual_mode.value, workers
         )
 
-        # Convert to dict format for JSON serialization
-        questions_dict = [
-            {
-                "id": q.id,
-                "prompt": q.prompt,
-                "options": q.options,
-                "answer_index": q.answer_index,
-                "metadata": {
-                    "resource_pair": q.metadata.resource_pair,
-                    "prompt_lang": q.metadata.prompt_lang,
-                    "from_lang": q.metadata.from_lang,
-                    "to_lang": q.metadata.to_lang,
-                    "difficulty": q.metadata.difficulty,
-                    "distractor_type": q.metadata.distractor_type,
-                    "generation_time": q.metadata.generation_time,
-                    "synset_id": q.metadata.synset_id,
-                    "multilingual_mode": q.metadata.multilingual_mode
-                }
-            }
-            for q in questions
-        ]
-
-        # Save to file
-        with open(output_filename, "w", encoding="utf-8") as f:
-            json.dump(questions_dict, f, indent=2, ensure_ascii=False)
+        # Written one question at a time, in the same layout as json.dump(indent=2), so downstream
+        # tools still read an indented JSON array; orjson serializes the Question/QuestionMetadata
+        # dataclasses directly, in field order
+        num_questions = 0
+        with open(output_filename, "wb") as f:
+            f.write(b"[")
+            for q in questions:
+                f.write(b",\n  " if num_questions else b"\n  ")
+                f.write(orjson.dumps(q, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  "))
+                num_questions += 1
+            f.write(b"\n]" if num_questions else b"]")
 
         # Print minimal statistics
-        print(f"Generated {len(questions_dict)} questions for {len(valid_entries)} language pairs")
+        print(f"Generated {num_questions} questions for {len(valid_entries)} language pairs")
         print(f"Saved to: {output_filename}")
 
 
+# Worker-process state for QuestionGenerator._generate_balanced_questions
+_pair_worker_generator = None
+_pair_worker_jobs = []
+
+
+def _init_pair_worker(generator: "QuestionGenerator", pair_jobs: List[Tuple]) -> None:
+    global _pair_worker_generator, _pair_worker_jobs
+    _pair_worker_generator = generator
+    _pair_worker_jobs = pair_jobs
+
+
+def _generate_pair_in_worker(job_index: int) -> List[Question]:
+    return _pair_worker_generator._generate_pair_questions(*_pair_worker_jobs[job_index])
+
+
 def main():
     """Main function to run question generation."""
     # Load data
     print("Loading data...")
-    with open("../GeneratedFiles/JsonFiles/multilingual_babelnet_relations.json", "r", encoding="utf-8") as f:
-        data = json.load(f)
+    with open("../GeneratedFiles/JsonFiles/multilingual_babelnet_relations.json", "rb") as f:
+        data = orjson.loads(f.read())
 
     # Initialize generator with different prompt styles
     # Available styles: "direct", "instructional", "few_shot", "cot", "multilingual_aware", "template", "original"
     prompt_style = "direct"  # Change this to test different prompt styles
     generator = QuestionGenerator(data, prompt_style=prompt_style)
 
+    # Worker processes for language pairs; each one is sent a copy of the generator, so raise
+    # this only when the machine has the cores and memory to spare (the output is the same)
+    workers = 1
+
     # Define tasks to generate
     tasks = [
         ("hypernymy", "hypernyms", "Hypernymy"),
@@ -887,7 +958,8 @@ def main():
                 relation_field=relation_field,
                 output_filename=output_file,
                 multilingual_mode=mode,
-                target_questions_per_pair=target_questions
+                target_questions_per_pair=target_questions,
+                workers=workers
             )
 
     print("Question generation complete!")
@@ -1,18 +1,24 @@
 import json
 import random
 from collections import defaultdict
-from datetime import datetime
+from datetime import datetime, timezone
 from dataclasses import dataclass
 from typing import Dict, List, Set, Tuple, Optional
 from enum import Enum
 from language_config import LANGUAGE_CONFIG
-from tqdm import tqdm
 import logging
 
 # Configure logging - reduced to WARNING level
 logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
 
+# Language lookups by code, built once from LANGUAGE_CONFIG
+_CODE_TO_NAME = {v["code"]: v["name"] for langs in LANGUAGE_CONFIG.values() for v in langs.values()}
+_CODE_TO_LEVEL = {v["code"]: level for level, langs in LANGUAGE_CONFIG.items() for v in langs.values()}
+
+# Semantic relation fields of a dataset entry, in the order they are scanned
+RELATION_TYPES = ("hypernyms", "hyponyms", "meronyms", "holonyms", "cohyponyms")
+
 
 class DifficultyLevel(Enum):
     RANDOM = 1
@@ -31,8 +37,14 @@ class MultilingualMode(Enum):
     ALL = "all"
 
 
-@dataclass
+@dataclass(frozen=True)
 class QuestionMetadata:
+    # Explicit __slots__ (dataclass(slots=True) needs Python 3.10) so the
+    # tens of thousands of instances built in ALL mode carry no __dict__.
+    __slots__ = ("resource_pair", "prompt_lang", "from_lang", "to_lang", "difficulty",
+                 "distractor_type", "generation_time", "synset_id", "multilingual_mode",
+                 "relation_type")
+
     resource_pair: str
     prompt_lang: str
     from_lang: str
@@ -45,8 +57,10 @@ class QuestionMetadata:
     relation_type: str
 
 
-@dataclass
+@dataclass(frozen=True)
 class Question:
+    __slots__ = ("id", "prompt", "options", "answer_index", "metadata")
+
     id: str
     prompt: str
     options: List[str]
@@ -55,11 +69,16 @@ class Question:
 
 
 class AnalogyGenerator:
-    def __init__(self, data: List[Dict], min_distractors: int = 3, n_choices: int = 4):
+    def __init__(self, data: List[Dict], min_distractors: int = 3, n_choices: int = 4,
+                 seed: Optional[int] = None):
         self.data = data
         self.min_distractors = min_distractors
         self.n_choices = n_choices
+        self._rng = random.Random(seed)
         self.lemma_lookup, self.semantic_relations = self._build_lemma_lookup()
+        self._lemma_tuples = {lang: tuple(lemmas) for lang, lemmas in self.lemma_lookup.items()}
+        self._prompt_templates = {}
+        self.generation_time = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
     def _build_lemma_lookup(self) -> Tuple[Dict[str, Set[str]], Dict[str, Dict[str, Set[str]]]]:
         """Build lookup tables for lemmas and semantic relations."""
@@ -72,7 +91,7 @@ class AnalogyGenerator:
                 lemma_lookup[lang_code].add(trans["lemma"])
 
             # Build semantic relation mappings
-            for rel_type in ["hypernyms", "hyponyms", "meronyms", "holonyms", "cohyponyms"]:
+            for rel_type in RELATION_TYPES:
                 for rel_entry in entry.get(rel_type, []):
                     for lang_code, trans in rel_entry.get("translations", {}).items():
                         lemma_lookup[lang_code].add(trans["lemma"])
@@ -83,11 +102,7 @@ class AnalogyGenerator:
     @staticmethod
     def _get_lang_info(lang_code: str) -> Tuple[Optional[str], Optional[str]]:
         """Get language name and resource level for a language code."""
-        for level, langs in LANGUAGE_CONFIG.items():
-            for lang, v in langs.items():
-                if v["code"] == lang_code:
-                    return v["name"], level
-        return None, None
+        return _CODE_TO_NAME.get(lang_code), _CODE_TO_LEVEL.get(lang_code)
 
     @staticmethod
     def _get_languages_by_resource(resource_level: str) -> List[str]:
@@ -144,24 +159,24 @@ class AnalogyGenerator:
     def _random_distractors(self, correct_lemma: str, all_candidates: Set[str],
                             target_lang: str, relation_type: str) -> Tuple[List[str], str]:
         """Generate random distractors."""
-        distractors = set(random.sample(list(all_candidates),
-                                        min(self.n_choices - 1, len(all_candidates))))
-        return self._finalize_distractors(distractors, correct_lemma, all_candidates), "random_unrelated"
+        distractors = set(self._rng.sample(list(all_candidates),
+                                           min(self.n_choices - 1, len(all_candidates))))
+        return self._finalize_distractors(distractors, correct_lemma, target_lang), "random_unrelated"
 
     def _mixed_distractors(self, correct_lemma: str, all_candidates: Set[str],
                            target_lang: str, relation_type: str) -> Tuple[List[str], str]:
         """Generate mixed random and semantic distractors."""
-        random_words = set(random.sample(list(all_candidates),
-                                         min(self.n_choices - 2, len(all_candidates))))
+        random_words = set(self._rng.sample(list(all_candidates),
+                                            min(self.n_choices - 2, len(all_candidates))))
         semantic_words = set()
 
         if target_lang in self.semantic_relations:
             cohyponyms = self.semantic_relations[target_lang].get("cohyponyms", set())
             if cohyponyms:
-                semantic_words = set(random.sample(list(cohyponyms), min(1, len(cohyponyms))))
+                semantic_words = set(self._rng.sample(list(cohyponyms), min(1, len(cohyponyms))))
 
         distractors = random_words.union(semantic_words)
-        return self._finalize_distractors(distractors, correct_lemma, all_candidates), "mixed_random_semantic"
+        return self._finalize_distractors(distractors, correct_lemma, target_lang), "mixed_random_semantic"
 
     def _semantic_distractors(self, correct_lemma: str, all_candidates: Set[str],
                               target_lang: str, relation_type: str) -> Tuple[List[str], str]:
@@ -174,16 +189,16 @@ class AnalogyGenerator:
             semantic_pool.update(self.semantic_relations[target_lang].get("cohyponyms", set()))
 
             if len(semantic_pool) >= self.n_choices - 1:
-                distractors = set(random.sample(list(semantic_pool), self.n_choices - 1))
+                distractors = set(self._rng.sample(list(semantic_pool), self.n_choices - 1))
             else:
                 distractors = semantic_pool.union(
-                    set(random.sample(list(all_candidates),
-                                      min(self.n_choices - 1 - len(semantic_pool), len(all_candidates))))
+                    set(self._rng.sample(list(all_candidates),
+                                         min(self.n_choices - 1 - len(semantic_pool), len(all_candidates))))
                 )
         else:
-            distractors = set(random.sample(list(all_candidates), self.n_choices - 1))
+            distractors = set(self._rng.sample(list(all_candidates), self.n_choices - 1))
 
-        return self._finalize_distractors(distractors, correct_lemma, all_candidates), "semantically_related"
+        return self._finalize_distractors(distractors, correct_lemma, target_lang), "semantically_related"
 
     def _close_semantic_distractors(self, correct_lemma: str, all_candidates: Set[str],
                                     target_lang: str, relation_type: str) -> Tuple[List[str], str]:
@@ -196,14 +211,14 @@ class AnalogyGenerator:
             close_matches.update(self.semantic_relations[target_lang].get("cohyponyms", set()))
 
         if len(close_matches) >= self.n_choices - 1:
-            distractors = set(random.sample(list(close_matches), self.n_choices - 1))
+            distractors = set(self._rng.sample(list(close_matches), self.n_choices - 1))
         else:
             semantic_pool = self.semantic_relations[target_lang].get("hypernyms", set())
             needed = self.n_choices - 1 - len(close_matches)
-            additional = set(random.sample(list(semantic_pool), min(needed, len(semantic_pool))))
+            additional = set(self._rng.sample(list(semantic_pool), min(needed, len(semantic_pool))))
             distractors = close_matches | additional
 
-        return self._finalize_distractors(distractors, correct_lemma, all_candidates), "close_semantic_matches"
+        return self._finalize_distractors(distractors, correct_lemma, target_lang), "close_semantic_matches"
 
     def _very_close_distractors(self, correct_lemma: str, all_candidates: Set[str],
                                 target_lang: str, relation_type: str) -> Tuple[List[str], str]:
@@ -216,45 +231,61 @@ class AnalogyGenerator:
             very_close_matches.update(self.semantic_relations[target_lang].get("meronyms", set()))
 
         if len(very_close_matches) >= self.n_choices - 1:
-            distractors = set(random.sample(list(very_close_matches), self.n_choices - 1))
+            distractors = set(self._rng.sample(list(very_close_matches), self.n_choices - 1))
         else:
             remaining_needed = self.n_choices - 1 - len(very_close_matches)
             other_semantic = (
                     self.semantic_relations[target_lang].get("hyponyms", set()) |
                     self.semantic_relations[target_lang].get("hypernyms", set())
             )
-            additional = set(random.sample(list(other_semantic), min(remaining_needed, len(other_semantic))))
+            additional = set(self._rng.sample(list(other_semantic), min(remaining_needed, len(other_semantic))))
             distractors = very_close_matches | additional
 
-        return self._finalize_distractors(distractors, correct_lemma, all_candidates), "very_close_matches"
+        return self._finalize_distractors(distractors, correct_lemma, target_lang), "very_close_matches"
 
     def _finalize_distractors(self, distractors: Set[str], correct_lemma: str,
-                              all_candidates: Set[str]) -> List[str]:
+                              target_lang: str) -> List[str]:
         """Finalize distractor set by removing correct answer and filling gaps."""
         distractors.discard(correct_lemma)
 
-        while len(distractors) < (self.n_choices - 1):
-            remaining = all_candidates - distractors - {correct_lemma}
-            if remaining:
-                distractors.add(random.choice(list(remaining)))
-            else:
-                break
+        needed = self.n_choices - 1 - len(distractors)
+        if needed > 0:
+            # Drawing needed + len(excluded) distinct lemmas guarantees enough
+            # usable candidates without copying the whole vocabulary.
+            excluded = distractors | {correct_lemma}
+            pool = self._lemma_tuples.get(target_lang, ())
+            for candidate in self._rng.sample(pool, min(len(pool), needed + len(excluded))):
+                if candidate in excluded:
+                    continue
+                distractors.add(candidate)
+                needed -= 1
+                if not needed:
+                    break
 
         return list(distractors)
 
-    def _create_prompt_text(self, from_code: str, to_code: str, A_lemma: str,
+    def _get_prompt_template(self, from_code: str, to_code: str) -> str:
+        """Get the prompt template for a language pair, resolving language names once per pair."""
+        key = (from_code, to_code)
+        template = self._prompt_templates.get(key)
+        if template is None:
+            from_lang_name, _ = self._get_lang_info(from_code)
+            to_lang_name, _ = self._get_lang_info(to_code)
+            template = (
+                f"Complete the analogy:\n\n"
+                f"{{A}} ({from_lang_name}) is to {{B}} ({from_lang_name})\n"
+                f"as\n"
+                f"{{C}} ({to_lang_name}) is to ____?\n\n"
+                f"Choose the correct option in {to_lang_name}:"
+            )
+            self._prompt_templates[key] = template
+        return template
+
+    @staticmethod
+    def _create_prompt_text(prompt_template: str, A_lemma: str,
                             B_lemma: str, C_lemma: str) -> Tuple[str, str]:
         """Create prompt text for the analogy question."""
-        from_lang_name, _ = self._get_lang_info(from_code)
-        to_lang_name, _ = self._get_lang_info(to_code)
-
-        prompt = (
-            f"Complete the analogy:\n\n"
-            f"{A_lemma} ({from_lang_name}) is to {B_lemma} ({from_lang_name})\n"
-            f"as\n"
-            f"{C_lemma} ({to_lang_name}) is to ____?\n\n"
-            f"Choose the correct option in {to_lang_name}:"
-        )
+        prompt = prompt_template.format(A=A_lemma, B=B_lemma, C=C_lemma)
 
         return prompt, "en"
 
@@ -265,8 +296,7 @@ class AnalogyGenerator:
 
         for entry in self.data:
             # Check if entry has any semantic relations
-            candidate_relations = [rel for rel in ["hypernyms", "hyponyms", "meronyms", "holonyms", "cohyponyms"]
-                                   if entry.get(rel)]
+            candidate_relations = [rel for rel in RELATION_TYPES if entry.get(rel)]
             if not candidate_relations:
                 continue
 
@@ -315,7 +345,7 @@ class AnalogyGenerator:
                     candidates.append((entry, rel_entry))
 
         if candidates:
-            return random.choice(candidates)
+            return self._rng.choice(candidates)
         return None
 
     def _generate_balanced_questions(self, valid_entries: Dict,
@@ -324,7 +354,7 @@ class AnalogyGenerator:
         """Generate balanced questions across language pairs and difficulty levels."""
         questions = []
         qid = 0
-        generation_time = datetime.utcnow().isoformat() + "Z"
+        generation_time = self.generation_time
 
         # Calculate questions per difficulty level
         num_difficulties = len(DifficultyLevel)
@@ -333,7 +363,8 @@ class AnalogyGenerator:
 
         for lang_pair, entries in valid_entries.items():
             from_code, to_code = lang_pair.split("_to_")
-            random.shuffle(entries)
+            prompt_template = self._get_prompt_template(from_code, to_code)
+            self._rng.shuffle(entries)
 
             # Track used analogy pairs to prevent repetitions
             used_pairs = set()
@@ -354,7 +385,7 @@ class AnalogyGenerator:
                     question = self._create_single_question(
                         entry, valid_relations, from_code, to_code,
                         difficulty_enum, qid, generation_time,
-                        multilingual_mode, used_pairs
+                        multilingual_mode, used_pairs, prompt_template
                     )
 
                     if question:
@@ -373,11 +404,12 @@ class AnalogyGenerator:
                                 from_code: str, to_code: str,
                                 difficulty: DifficultyLevel, qid: int,
                                 generation_time: str, multilingual_mode: str,
-                                used_pairs: Set[Tuple[str, str]]) -> Optional[Question]:
+                                used_pairs: Set[Tuple[str, str]],
+                                prompt_template: str) -> Optional[Question]:
         """Create a single analogy question from entry data."""
         try:
             # Pick a semantic relation to use
-            relation_type, relation_entry = random.choice(valid_relations)
+            relation_type, relation_entry = self._rng.choice(valid_relations)
 
             # Get A and B (first pair)
             A_lemma = entry["translations"][from_code]["lemma"]
@@ -405,12 +437,12 @@ class AnalogyGenerator:
             )
 
             options = distractors + [D_correct_lemma]
-            random.shuffle(options)
+            self._rng.shuffle(options)
             answer_index = options.index(D_correct_lemma)
 
             # Create prompt
             prompt_text, prompt_lang_code = self._create_prompt_text(
-                from_code, to_code, A_lemma, B_lemma, C_lemma
+                prompt_template, A_lemma, B_lemma, C_lemma
             )
 
             from_resource = self._get_lang_info(from_code)[1]
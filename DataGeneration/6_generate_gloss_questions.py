@@ -11,6 +11,10 @@ import logging
 logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
 
+# Language lookups by code, built once from LANGUAGE_CONFIG
+_CODE_TO_NAME = {v["code"]: v["name"] for langs in LANGUAGE_CONFIG.values() for v in langs.values()}
+_CODE_TO_LEVEL = {v["code"]: level for level, langs in LANGUAGE_CONFIG.items() for v in langs.values()}
+
 
 class DifficultyLevel(Enum):
     RANDOM = 1
@@ -55,6 +59,7 @@ class GlossQuestionGenerator:
         self.min_distractors = min_distractors
         self.n_choices = n_choices
         self.lemma_lookup = self._build_lemma_lookup()
+        self._lemma_tuples = {lang: tuple(lemmas) for lang, lemmas in self.lemma_lookup.items()}
 
     def _build_lemma_lookup(self) -> Dict[str, Set[str]]:
         lemma_lookup = defaultdict(set)
@@ -65,11 +70,7 @@ class GlossQuestionGenerator:
 
     @staticmethod
     def _get_lang_info(lang_code: str) -> Tuple[Optional[str], Optional[str]]:
-        for level, langs in LANGUAGE_CONFIG.items():
-            for lang, v in langs.items():
-                if v["code"] == lang_code:
-                    return v["name"], level
-        return None, None
+        return _CODE_TO_NAME.get(lang_code), _CODE_TO_LEVEL.get(lang_code)
 
     @staticmethod
     def _get_languages_by_resource(resource_level: str) -> List[str]:
@@ -118,14 +119,18 @@ class GlossQuestionGenerator:
 
         return valid_entries
 
-    def _generate_distractors(self, correct_lemma: str, all_candidates: Set[str], difficulty: DifficultyLevel) -> Tuple[List[str], str]:
-        filtered = all_candidates - {correct_lemma}
+    def _sample_excluding(self, all_candidates: Tuple[str, ...], correct_lemma: str) -> List[str]:
+        # One extra draw covers the correct lemma, without copying the vocabulary to exclude it
+        sample = random.sample(all_candidates, min(self.n_choices, len(all_candidates)))
+        return [lemma for lemma in sample if lemma != correct_lemma][:self.n_choices - 1]
+
+    def _generate_distractors(self, correct_lemma: str, all_candidates: Tuple[str, ...], difficulty: DifficultyLevel) -> Tuple[List[str], str]:
         if difficulty == DifficultyLevel.RANDOM:
-            distractors = random.sample(list(filtered), min(self.n_choices - 1, len(filtered)))
+            distractors = self._sample_excluding(all_candidates, correct_lemma)
             return distractors, "random"
         else:
             # For now, same as random, can be improved with semantic proximity
-            distractors = random.sample(list(filtered), min(self.n_choices - 1, len(filtered)))
+            distractors = self._sample_excluding(all_candidates, correct_lemma)
             return distractors, "random"
 
     def _create_prompt_text(self, gloss_text: str, from_lang: str, to_lang: str) -> Tuple[str, str]:
@@ -145,84 +150,84 @@ class GlossQuestionGenerator:
             print(f"No valid entries for {multilingual_mode.value}")
             return
 
-        questions = []
         qid = 0
         generation_time = datetime.utcnow().isoformat() + "Z"
+        questions_per_diff = target_questions_per_pair // len(DifficultyLevel)
 
-        for lang_pair, entries in valid_entries.items():
-            from_code, to_code = lang_pair.split("_to_")
-            random.shuffle(entries)
-            used_glosses = set()
-            questions_per_diff = target_questions_per_pair // len(DifficultyLevel)
-
-            for difficulty in DifficultyLevel:
-                generated_count = 0
-                for entry in entries:
-                    gloss_info = entry["glossary"].get(from_code)
-                    if not gloss_info:
-                        continue
-                    gloss_text = gloss_info.get("text", "").strip()
-                    if not gloss_text or gloss_text in used_glosses:
-                        continue
-
-                    correct_lemma = entry["translations"][to_code]["lemma"]
-                    all_candidates = self.lemma_lookup[to_code]
-                    if len(all_candidates) < self.min_distractors:
-                        continue
-
-                    distractors, distractor_type = self._generate_distractors(correct_lemma, all_candidates, difficulty)
-                    if len(distractors) < self.n_choices - 1:
-                        continue
-
-                    options = distractors + [correct_lemma]
-                    random.shuffle(options)
-                    answer_index = options.index(correct_lemma)
-
-                    prompt_text, prompt_lang_code = self._create_prompt_text(gloss_text, from_code, to_code)
-                    from_resource = self._get_lang_info(from_code)[1]
-                    to_resource = self._get_lang_info(to_code)[1]
-                    resource_pair = f"{from_resource}_to_{to_resource}"
-
-                    metadata = QuestionMetadata(
-                        resource_pair=resource_pair,
-                        prompt_lang=prompt_lang_code,
-                        from_lang=from_code,
-                        to_lang=to_code,
-                        difficulty=difficulty.value,
-                        distractor_type=distractor_type,
-                        generation_time=generation_time,
-                        synset_id=entry.get("synset_id", ""),
-                        multilingual_mode=multilingual_mode.value
-                    )
-
-                    questions.append(Question(
-                        id=f"gloss_{qid}_{from_code}_to_{to_code}_diff{difficulty.value}",
-                        prompt=prompt_text,
-                        options=options,
-                        answer_index=answer_index,
-                        metadata=metadata
-                    ))
-                    used_glosses.add(gloss_text)
-                    qid += 1
-                    generated_count += 1
-                    if generated_count >= questions_per_diff:
-                        break
-
-        questions_dict = [
-            {
-                "id": q.id,
-                "prompt": q.prompt,
-                "options": q.options,
-                "answer_index": q.answer_index,
-                "metadata": vars(q.metadata)
-            }
-            for q in questions
-        ]
-
+        # Each question is written out as soon as it is built (same layout as json.dump(indent=2)),
+        # so the questionnaire is never held in memory
         with open(output_filename, "w", encoding="utf-8") as f:
-            json.dump(questions_dict, f, indent=2, ensure_ascii=False)
-
-        print(f"Generated {len(questions_dict)} questions across {len(valid_entries)} language pairs")
+            f.write("[")
+            for lang_pair, entries in valid_entries.items():
+                from_code, to_code = lang_pair.split("_to_")
+                random.shuffle(entries)
+                used_glosses = set()
+
+                for difficulty in DifficultyLevel:
+                    generated_count = 0
+                    for entry in entries:
+                        gloss_info = entry["glossary"].get(from_code)
+                        if not gloss_info:
+                            continue
+                        gloss_text = gloss_info.get("text", "").strip()
+                        if not gloss_text or gloss_text in used_glosses:
+                            continue
+
+                        correct_lemma = entry["translations"][to_code]["lemma"]
+                        all_candidates = self._lemma_tuples[to_code]
+                        if len(all_candidates) < self.min_distractors:
+                            continue
+
+                        distractors, distractor_type = self._generate_distractors(correct_lemma, all_candidates, difficulty)
+                        if len(distractors) < self.n_choices - 1:
+                            continue
+
+                        options = distractors + [correct_lemma]
+                        random.shuffle(options)
+                        answer_index = options.index(correct_lemma)
+
+                        prompt_text, prompt_lang_code = self._create_prompt_text(gloss_text, from_code, to_code)
+                        from_resource = self._get_lang_info(from_code)[1]
+                        to_resource = self._get_lang_info(to_code)[1]
+                        resource_pair = f"{from_resource}_to_{to_resource}"
+
+                        metadata = QuestionMetadata(
+                            resource_pair=resource_pair,
+                            prompt_lang=prompt_lang_code,
+                            from_lang=from_code,
+                            to_lang=to_code,
+                            difficulty=difficulty.value,
+                            distractor_type=distractor_type,
+                            generation_time=generation_time,
+                            synset_id=entry.get("synset_id", ""),
+                            multilingual_mode=multilingual_mode.value
+                        )
+
+                        q = Question(
+                            id=f"gloss_{qid}_{from_code}_to_{to_code}_diff{difficulty.value}",
+                            prompt=prompt_text,
+                            options=options,
+                            answer_index=answer_index,
+                            metadata=metadata
+                        )
+                        q_dict = {
+                            "id": q.id,
+                            "prompt": q.prompt,
+                            "options": q.options,
+                            "answer_index": q.answer_index,
+                            "metadata": vars(q.metadata)
+                        }
+                        f.write(",\n  " if qid else "\n  ")
+                        f.write(json.dumps(q_dict, indent=2, ensure_ascii=False).replace("\n", "\n  "))
+                        used_glosses.add(gloss_text)
+                        qid += 1
+                        generated_count += 1
+                        if generated_count >= questions_per_diff:
+                            break
+
+            f.write("\n]" if qid else "]")
+
+        print(f"Generated {qid} questions across {len(valid_entries)} language pairs")
         print(f"Saved to: {output_filename}")
 
 
@@ -1,6 +1,159 @@
+import logging
+import os
+import shelve
+import threading
+import time
 import babelnet as bn
 from babelnet import BabelSynsetID, Language
 from babelnet.data.relation import BabelPointer
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# Bump after switching BabelNet versions, so a persistent relation cache isn't reused across them
+RELATION_CACHE_VERSION = "1"
+
+# Cap on BabelNet calls per second across all threads (every call made through babelnet_request()),
+# to stay within the API key's request budget when callers fan out. Set it with the
+# BABELNET_MAX_REQUESTS_PER_SECOND environment variable; unset or 0 disables throttling.
+MAX_REQUESTS_PER_SECOND = float(os.environ.get("BABELNET_MAX_REQUESTS_PER_SECOND", 0)) or None
+_next_request_time = 0.0
+_throttle_lock = threading.Lock()
+
+# In-memory by default; persistent_relation_cache() swaps in a shelf for the duration of a run
+_relation_cache = {}
+_relation_cache_lock = threading.Lock()
+
+# Cap on BabelNet calls in flight across all threads and pools (callers' own workers included),
+# so nesting pools doesn't multiply the number of concurrent requests
+MAX_CONCURRENT_REQUESTS = 8
+_request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+
+# Edge targets' synsets are fetched in parallel batches; lemma lookups never submit to this pool,
+# so callers that are themselves pool workers can't deadlock on it. Created on first use.
+MAX_PREFETCH_WORKERS = 8
+_prefetch_pool = None
+_prefetch_pool_lock = threading.Lock()
+
+
+class RelatedSynset(NamedTuple):
+    """A synset reached through a relation edge."""
+    id: str
+    lemma: str
+
+
+@lru_cache(maxsize=100_000)
+def cached_get_synset(synset_id: str):
+    """Fetch a synset by ID string, memoized so relation passes don't refetch the same synset."""
+    with babelnet_request():
+        return bn.get_synset(BabelSynsetID(synset_id))
+
+
+@contextmanager
+def babelnet_request():
+    """Wait for the rate cap, then hold one of the MAX_CONCURRENT_REQUESTS slots for a single BabelNet call.
+
+    Not reentrant: wrap only the call itself, never code that may wait on another request.
+    """
+    # Waiting happens before taking a slot, so a throttled thread doesn't block the others' calls
+    throttle_requests()
+    with _request_slots:
+        yield
+
+
+def _get_prefetch_pool():
+    global _prefetch_pool
+    with _prefetch_pool_lock:
+        if _prefetch_pool is None:
+            _prefetch_pool = ThreadPoolExecutor(max_workers=MAX_PREFETCH_WORKERS)
+    return _prefetch_pool
+
+
+def throttle_requests():
+    """Block until the next BabelNet request slot under MAX_REQUESTS_PER_SECOND."""
+    global _next_request_time
+    if not MAX_REQUESTS_PER_SECOND:
+        return
+    with _throttle_lock:
+        now = time.monotonic()
+        wait = _next_request_time - now
+        _next_request_time = max(now, _next_request_time) + 1.0 / MAX_REQUESTS_PER_SECOND
+    if wait > 0:
+        time.sleep(wait)
+
+
+@contextmanager
+def persistent_relation_cache(path):
+    """Back the edge and lemma caches with a shelf at path, so reruns skip BabelNet for known synsets."""
+    global _relation_cache
+    with shelve.open(path) as shelf:
+        _relation_cache = shelf
+        try:
+            yield
+        finally:
+            _relation_cache = {}
+
+
+def _cached_lookup(key, compute):
+    """Return the relation-cache value for key, computing and storing it on a miss."""
+    key = f"{RELATION_CACHE_VERSION}:{key}"
+    with _relation_cache_lock:
+        value = _relation_cache.get(key)
+    if value is None:
+        value = compute()
+        with _relation_cache_lock:
+            _relation_cache[key] = value
+    return value
+
+
+@lru_cache(maxsize=100_000)
+def cached_edge_targets(synset_id: str, pointer):
+    """Get the target synset IDs of a synset's outgoing edges for one pointer, memoized.
+
+    Siblings share hypernyms, so the hypernym -> hyponym edge lists walked by
+    get_cohyponyms are reused across synsets instead of being refetched.
+    """
+    return _cached_lookup(f"edges:{synset_id}:{pointer}", lambda: _fetch_edge_targets(synset_id, pointer))
+
+
+def _fetch_edge_targets(synset_id: str, pointer):
+    synset = cached_get_synset(synset_id)
+    with babelnet_request():
+        return tuple(edge.id_target.id for edge in synset.outgoing_edges(pointer))
+
+
+def edge_targets_or_empty(synset_id: str, pointer, relation_type: str):
+    """Like cached_edge_targets, but a failed lookup logs and yields no targets instead of raising."""
+    try:
+        return cached_edge_targets(synset_id, pointer)
+    except Exception as e:
+        logger.warning("Error fetching %s for %s: %s: %s", relation_type, synset_id, type(e).__name__, e)
+        return ()
+
+
+@lru_cache(maxsize=100_000)
+def cached_lemma(synset_id: str):
+    """Get the English lemma for a synset ID, memoized alongside cached_get_synset.
+
+    Fetch errors propagate (and are not memoized), so callers can tell them
+    apart from a synset that has no English lemma ("N/A").
+    """
+    return _cached_lookup(f"lemma:{synset_id}", lambda: get_lemma(cached_get_synset(synset_id)))
+
+
+def get_lemma_cached(synset_id: str):
+    """Like cached_lemma, but a synset that cannot be fetched counts as having no lemma ("N/A").
+
+    One bad edge is thus skipped rather than aborting the whole relation list.
+    """
+    try:
+        return cached_lemma(synset_id)
+    except Exception:
+        logger.debug("Could not resolve lemma for %s", synset_id, exc_info=True)
+        return "N/A"
 
 
 def fetch_hypernyms(synset, max_items=10):
@@ -31,78 +184,80 @@ def fetch_meronyms(synset, max_items=10):
         BabelPointer.SUBSTANCE_MERONYM
     ]
     items = []
-    try:
-        for pointer in meronym_pointers:
-            items.extend(fetch_edges(synset, pointer=pointer, relation_type="meronym"))
-            if len(items) >= max_items:
-                break
-    except Exception as e:
-        print(f"[!] Error fetching meronyms for {synset.id}: {type(e).__name__}: {e}")
+    seen_lemmas = set()
+    for pointer in meronym_pointers:
+        items.extend(fetch_edges(synset, pointer=pointer, relation_type="meronym",
+                                 max_items=max_items - len(items), seen_lemmas=seen_lemmas))
+        if len(items) >= max_items:
+            break
     return items[:max_items]
 
 
 def get_cohyponyms(synset, max_items=10):
-    """Fetch co-hyponyms (siblings) of the synset."""
+    """Fetch co-hyponyms (siblings) of the synset, skipping repeated lemmas."""
     cohyponyms = []
-    try:
-        hypernym_edges = synset.outgoing_edges(BabelPointer.ANY_HYPERNYM)
-        for hypernym_edge in hypernym_edges:
-            hypernym_synset = bn.get_synset(hypernym_edge.id_target)
-            hyponym_edges = hypernym_synset.outgoing_edges(BabelPointer.ANY_HYPONYM)
-            for hyponym_edge in hyponym_edges:
-                if hyponym_edge.id_target.id != synset.id.id:
-                    target_synset = bn.get_synset(hyponym_edge.id_target)
-                    lemma = get_lemma(target_synset)
-                    if lemma != "N/A":
-                        cohyponyms.append({
-                            "id": hyponym_edge.id_target.id,
-                            "lemma": lemma
-                        })
-                if len(cohyponyms) >= max_items:
-                    break
-            if len(cohyponyms) >= max_items:
-                break
-    except Exception as e:
-        print(f"[!] Error fetching co-hyponyms for {synset.id}: {type(e).__name__}: {e}")
+    synset_id = synset.id.id
+    # Siblings reachable through several hypernyms are only looked at once
+    seen_ids = {synset_id}
+    seen_lemmas = {"N/A"}
+    for hypernym_id in edge_targets_or_empty(synset_id, BabelPointer.ANY_HYPERNYM, "hypernym"):
+        siblings = [target_id for target_id in dict.fromkeys(
+            edge_targets_or_empty(hypernym_id, BabelPointer.ANY_HYPONYM, "co-hyponym")
+        ) if target_id not in seen_ids]
+        seen_ids.update(siblings)
+        collect_related(siblings, cohyponyms, max_items, seen_lemmas)
+        if len(cohyponyms) >= max_items:
+            break
     return cohyponyms
 
 
-def fetch_edges(synset, pointer, relation_type, max_items=10):
-    """Generic edge fetcher for a synset given a pointer and relation type."""
+def fetch_edges(synset, pointer, relation_type, max_items=10, seen_lemmas=None):
+    """Generic edge fetcher for a synset given a pointer and relation type.
+
+    Lemmas already in seen_lemmas are skipped, so max_items counts distinct
+    lemmas; pass a shared set to dedup across several pointers.
+    """
+    if seen_lemmas is None:
+        seen_lemmas = set()
     items = []
-    try:
-        edges = synset.outgoing_edges(pointer)
-        for edge in edges:
-            if len(items) >= max_items:
-                break
-            target_synset = bn.get_synset(edge.id_target)
-            lemma = get_lemma(target_synset)
-            if lemma != "N/A":
-                items.append({
-                    "id": edge.id_target.id,
-                    "lemma": lemma
-                })
-    except Exception as e:
-        print(f"[!] Error fetching {relation_type} for {synset.id}: {type(e).__name__}: {e}")
+    collect_related(edge_targets_or_empty(synset.id.id, pointer, relation_type), items, max_items, seen_lemmas)
     return items
 
 
+def collect_related(target_ids, items, max_items, seen_lemmas):
+    """Append a RelatedSynset to items for each target with a new lemma, until max_items.
+
+    The targets' lemmas are looked up in parallel, one batch per round. A batch is
+    never bigger than the number of items still missing, so no target is fetched
+    that a one-by-one scan would have skipped, and the order is unchanged.
+    """
+    start = 0
+    while start < len(target_ids) and len(items) < max_items:
+        batch = target_ids[start:start + max_items - len(items)]
+        start += len(batch)
+        for target_id, lemma in zip(batch, _get_prefetch_pool().map(get_lemma_cached, batch)):
+            if lemma != "N/A" and lemma not in seen_lemmas:
+                seen_lemmas.add(lemma)
+                items.append(RelatedSynset(target_id, lemma))
+
+
 def get_lemma(synset):
     """Get the English lemma for a synset, or 'N/A' if not found."""
-    main_sense = synset.main_sense(Language.EN)
+    with babelnet_request():
+        main_sense = synset.main_sense(Language.EN)
     if main_sense:
         return main_sense.full_lemma
     return "N/A"
 
 
 def deduplicate(items):
-    """Remove duplicates from a list of dicts by lemma."""
+    """Remove duplicates from a list of RelatedSynset items by lemma."""
     seen = set()
     deduped = []
     for item in items:
-        if item["lemma"] not in seen:
+        if item.lemma not in seen:
             deduped.append(item)
-            seen.add(item["lemma"])
+            seen.add(item.lemma)
     return deduped
 
 
@@ -113,13 +268,13 @@ def print_list(title, items):
         print("   (none found)")
     else:
         for i, item in enumerate(items, start=1):
-            print(f"   [{i}] {item['lemma']} ({item['id']})")
+            print(f"   [{i}] {item.lemma} ({item.id})")
 
 
 def print_relations(synset_id_str, max_items=10):
     """Fetch and print all relevant relations for a given synset ID."""
     try:
-        synset = bn.get_synset(BabelSynsetID(synset_id_str))
+        synset = cached_get_synset(synset_id_str)
         lemma = get_lemma(synset)
         print(f"\n=== Synset: {lemma} ({synset_id_str}) ===")
     except Exception as e:
@@ -157,6 +312,19 @@ def print_relations(synset_id_str, max_items=10):
     print_list("Co-Hyponyms", cohyponyms)
 
 
+def prefetch_relations(synset_id_str, max_items=10):
+    """Run every relation fetch for a synset once, so print_relations is served from the caches.
+
+    Failures are left for print_relations to retry and report.
+    """
+    try:
+        synset = cached_get_synset(synset_id_str)
+        for fetch in (fetch_hypernyms, fetch_hyponyms, fetch_meronyms, get_cohyponyms):
+            fetch(synset, max_items)
+    except Exception:
+        logger.debug("Prefetch failed for %s", synset_id_str, exc_info=True)
+
+
 if __name__ == "__main__":
     # Example BabelNet synset IDs (feel free to add more or replace)
     synset_ids = [
@@ -165,5 +333,9 @@ if __name__ == "__main__":
         "bn:00104078a",
     ]
 
+    # The synsets are independent, so fetch them concurrently, then print in order
+    with ThreadPoolExecutor(max_workers=len(synset_ids)) as executor:
+        list(executor.map(prefetch_relations, synset_ids))
+
     for sid in synset_ids:
         print_relations(sid)
@@ -1,21 +1,47 @@
 import json
+import orjson
 import random
+import sys
 from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
 from babelnet import Language
 from language_config import LANGUAGE_CONFIG
 
 NUM_QUESTIONS_PER_TYPE = 5000   # adjust as you like
+DATA_PATH = "../GeneratedFiles/JsonFiles/multilingual_babelnet_relations.json"
 
-# Load your JSON data
-with open("../GeneratedFiles/JsonFiles/multilingual_babelnet_relations.json", "r", encoding="utf-8") as f:
-    data = json.load(f)
+# Language lookups by code, built once from LANGUAGE_CONFIG
+_CODE_TO_NAME = {v["code"]: v["name"] for langs in LANGUAGE_CONFIG.values() for v in langs.values()}
+_CODE_TO_LEVEL = {v["code"]: level for level, langs in LANGUAGE_CONFIG.items() for v in langs.values()}
+
+# Resource levels and their language entries as lists, so pick_language_pair needn't copy them per question
+_LEVELS = list(LANGUAGE_CONFIG)
+_LANGS_BY_LEVEL = {level: list(langs.values()) for level, langs in LANGUAGE_CONFIG.items()}
 
 
 # ---------------------------
 # Helpers
 # ---------------------------
 
+@lru_cache(maxsize=None)
+def load_data():
+    """Load the relations JSON on first use, so importing this module does no I/O."""
+    with open(DATA_PATH, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    intern_language_codes(data)
+    return data
+
+
+def intern_language_codes(data):
+    """Intern the translation keys loaded from JSON so lookups against config codes compare by identity."""
+    for entry in data:
+        entry["translations"] = {sys.intern(k): v for k, v in entry.get("translations", {}).items()}
+        for rel_type in ["hypernyms", "hyponyms", "meronyms", "cohyponyms"]:
+            for rel_entry in entry.get(rel_type, []):
+                rel_entry["translations"] = {sys.intern(k): v for k, v in rel_entry.get("translations", {}).items()}
+
+
 def build_lemma_lookup(data):
     lemma_lookup = defaultdict(set)
     semantic_relations = defaultdict(lambda: defaultdict(set))
@@ -38,111 +64,121 @@ def build_lemma_lookup(data):
 
 
 def pick_resource_level(lang_code):
-    for level, langs in LANGUAGE_CONFIG.items():
-        for lang, v in langs.items():
-            if v["code"] == lang_code:
-                return level
-    return None
+    return _CODE_TO_LEVEL.get(lang_code)
 
 
 def get_lang_name(lang_code):
-    for level, langs in LANGUAGE_CONFIG.items():
-        for lang, v in langs.items():
-            if v["code"] == lang_code:
-                return v["name"]
-    return None
+    return _CODE_TO_NAME.get(lang_code)
 
 
 def pick_language_pair():
-    levels = list(LANGUAGE_CONFIG.keys())
-    from_level = random.choice(levels)
-    to_level = random.choice(levels)
+    from_level = random.choice(_LEVELS)
+    to_level = random.choice(_LEVELS)
 
-    from_lang = random.choice(list(LANGUAGE_CONFIG[from_level].values()))
-    to_lang = random.choice(list(LANGUAGE_CONFIG[to_level].values()))
+    from_lang = random.choice(_LANGS_BY_LEVEL[from_level])
+    to_lang = random.choice(_LANGS_BY_LEVEL[to_level])
 
     return from_lang, to_lang, f"{from_level}_to_{to_level}"
 
 
-def generate_options(correct_lemma, all_candidates, semantic_relations,
-                     target_lang, entry, relation_field, n_choices=4, difficulty=3):
-    distractors = set()
+def build_option_pools(lemma_lookup, semantic_relations, n_choices=4):
+    """Pre-merge the distractor pools for every target language once, as lists."""
+    pools = {}
+    for lang_code, lemmas in lemma_lookup.items():
+        relations = semantic_relations.get(lang_code, {})
+        cohyponyms = relations.get("cohyponyms", set())
+        hyponyms = relations.get("hyponyms", set())
+        hypernyms = relations.get("hypernyms", set())
+        very_close = relations.get("meronyms", set()) | cohyponyms
+
+        if len(cohyponyms) >= n_choices - 1:
+            related = list(cohyponyms)
+        else:
+            related = list(cohyponyms | hyponyms | hypernyms)
+
+        pools[lang_code] = {
+            "candidates": list(lemmas),
+            "cohyponyms": list(cohyponyms),
+            "related": related,
+            "hyponyms": list(hyponyms),
+            "very_close": list(very_close),
+            "other_semantic": list((hyponyms | hypernyms) - very_close),
+        }
+    return pools
+
+
+def build_entry_hypernym_lemmas(data):
+    """Map id(entry) -> {lang_code: [distinct hypernym lemmas]} so difficulty 4 needn't rescan the entry."""
+    entry_hypernym_lemmas = {}
+    for entry in data:
+        by_lang = defaultdict(list)
+        for hypernym_entry in entry.get("hypernyms", []):
+            for lang_code, trans in hypernym_entry.get("translations", {}).items():
+                by_lang[lang_code].append(trans["lemma"])
+        entry_hypernym_lemmas[id(entry)] = {
+            lang_code: list(dict.fromkeys(lemmas)) for lang_code, lemmas in by_lang.items()
+        }
+    return entry_hypernym_lemmas
+
+
+def sample_up_to(pool, k):
+    return set(random.sample(pool, min(k, len(pool)))) if k > 0 else set()
+
+
+def sample_union_up_to(pool, extra, k):
+    """Sample up to k distinct lemmas from pool + extra without building the concatenation.
+
+    Both lists are duplicate-free, so they share at most len(extra) lemmas; drawing
+    that many more indices than needed is enough to reach k distinct ones.
+    """
+    n = len(pool) + len(extra)
+    sampled = set()
+    for i in random.sample(range(n), min(k + len(extra), n)):
+        if len(sampled) >= k:
+            break
+        sampled.add(pool[i] if i < len(pool) else extra[i - len(pool)])
+    return sampled
+
+
+def generate_options(correct_lemma, pools, target_lang, hypernym_lemmas, relation_field, n_choices=4, difficulty=3):
+    lang_pools = pools[target_lang]
+    candidates = lang_pools["candidates"]
+    needed = n_choices - 1
 
     if difficulty == 1:
-        distractors = set(random.sample(list(all_candidates), min(n_choices - 1, len(all_candidates))))
+        distractors = sample_up_to(candidates, needed)
         distractor_type = "random_unrelated"
 
     elif difficulty == 2:
-        random_words = set(random.sample(list(all_candidates), min(n_choices - 2, len(all_candidates))))
-        semantic_words = set()
-        if target_lang in semantic_relations and "cohyponyms" in semantic_relations[target_lang]:
-            cohyponyms = semantic_relations[target_lang]["cohyponyms"]
-            if cohyponyms:
-                semantic_words = set(random.sample(list(cohyponyms), min(1, len(cohyponyms))))
-        distractors = random_words.union(semantic_words)
+        distractors = sample_up_to(candidates, needed - 1)
+        if lang_pools["cohyponyms"]:
+            distractors.add(random.choice(lang_pools["cohyponyms"]))
         distractor_type = "mixed_random_semantic"
 
     elif difficulty == 3:
-        if target_lang in semantic_relations:
-            cohyponyms = semantic_relations[target_lang].get("cohyponyms", set())
-            if len(cohyponyms) >= n_choices - 1:
-                distractors = set(random.sample(list(cohyponyms), n_choices - 1))
-            else:
-                other_relations = semantic_relations[target_lang].get("hyponyms", set()).union(
-                    semantic_relations[target_lang].get("hypernyms", set())
-                )
-                available = cohyponyms.union(other_relations)
-                if len(available) >= n_choices - 1:
-                    distractors = set(random.sample(list(available), n_choices - 1))
-                else:
-                    distractors = available.union(
-                        set(random.sample(list(all_candidates), n_choices - 1 - len(available)))
-                    )
-        else:
-            distractors = set(random.sample(list(all_candidates), n_choices - 1))
+        distractors = sample_up_to(lang_pools["related"], needed)
         distractor_type = "semantically_related"
 
     elif difficulty == 4:
-        close_matches = set()
-        if target_lang in semantic_relations and "hyponyms" in semantic_relations[target_lang]:
-            close_matches.update(semantic_relations[target_lang]["hyponyms"])
-        for hypernym_entry in entry.get("hypernyms", []):
-            if target_lang in hypernym_entry.get("translations", {}):
-                close_matches.add(hypernym_entry["translations"][target_lang]["lemma"])
-        if len(close_matches) >= n_choices - 1:
-            distractors = set(random.sample(list(close_matches), n_choices - 1))
-        else:
-            semantic_pool = semantic_relations[target_lang].get("cohyponyms", set())
-            distractors = close_matches.union(
-                set(random.sample(list(semantic_pool), min(n_choices - 1 - len(close_matches), len(semantic_pool))))
-            )
+        distractors = sample_union_up_to(lang_pools["hyponyms"], hypernym_lemmas.get(target_lang, []), needed)
+        if len(distractors) < needed:
+            distractors |= sample_up_to(lang_pools["cohyponyms"], needed - len(distractors))
         distractor_type = "close_semantic_matches"
 
     else:  # difficulty == 5
-        very_close_matches = set()
-        if target_lang in semantic_relations:
-            very_close_matches.update(semantic_relations[target_lang].get("meronyms", set()))
-            cohyponyms = semantic_relations[target_lang].get("cohyponyms", set())
-            very_close_matches.update(cohyponyms)
-        if len(very_close_matches) >= n_choices - 1:
-            distractors = set(random.sample(list(very_close_matches), n_choices - 1))
-        else:
-            remaining_needed = n_choices - 1 - len(very_close_matches)
-            other_semantic = semantic_relations[target_lang].get("hyponyms", set()).union(
-                semantic_relations[target_lang].get("hypernyms", set())
-            )
-            distractors = very_close_matches.union(
-                set(random.sample(list(other_semantic), min(remaining_needed, len(other_semantic))))
-            )
+        distractors = sample_up_to(lang_pools["very_close"], needed)
+        if len(distractors) < needed:
+            distractors |= sample_up_to(lang_pools["other_semantic"], needed - len(distractors))
         distractor_type = "very_close_matches"
 
     distractors.discard(correct_lemma)
-    while len(distractors) < (n_choices - 1):
-        remaining = all_candidates - distractors - {correct_lemma}
-        if remaining:
-            distractors.add(random.choice(list(remaining)))
-        else:
-            break
+    # Top up by rejection sampling; the correct lemma is always in candidates,
+    # so at most len(candidates) - 1 distinct distractors exist.
+    target_size = min(needed, len(candidates) - 1)
+    while len(distractors) < target_size:
+        word = candidates[random.randrange(len(candidates))]
+        if word != correct_lemma:
+            distractors.add(word)
 
     return list(distractors), distractor_type
 
@@ -151,11 +187,17 @@ def generate_options(correct_lemma, all_candidates, semantic_relations,
 # Task Generation
 # ---------------------------
 
-lemma_lookup, semantic_relations = build_lemma_lookup(data)
 generation_time = datetime.utcnow().isoformat() + "Z"
 
 
 def create_prompt_text(task_type, from_code, to_code, prompt_word):
+    prefix, suffix, prompt_lang = prompt_template(task_type, from_code, to_code)
+    return f"{prefix}{prompt_word}{suffix}", prompt_lang
+
+
+@lru_cache(maxsize=None)
+def prompt_template(task_type, from_code, to_code):
+    """Text around the prompt word for a task and language pair, as (prefix, suffix, prompt language)."""
     # Compose prompt text based on language and relation
     if task_type == "hypernymy":
         relation_phrase_en = "a hypernym (broader category)"
@@ -168,12 +210,12 @@ def create_prompt_text(task_type, from_code, to_code, prompt_word):
         relation_phrase_es = "una relación semántica"
 
     if from_code == "es":
-        return f"¿Cuál de las siguientes es {relation_phrase_es} de la palabra \"{prompt_word}\"? (Opciones en {get_lang_name(to_code)}.)", "es"
+        return f"¿Cuál de las siguientes es {relation_phrase_es} de la palabra \"", f"\"? (Opciones en {get_lang_name(to_code)}.)", "es"
     else:
-        return f"Which of the following is {relation_phrase_en} of the {get_lang_name(from_code)} word \"{prompt_word}\"? (Options in {get_lang_name(to_code)}.)", "en"
+        return f"Which of the following is {relation_phrase_en} of the {get_lang_name(from_code)} word \"", f"\"? (Options in {get_lang_name(to_code)}.)", "en"
 
 
-def generate_task(task_type, relation_field, output_filename):
+def generate_task(task_type, relation_field, output_filename, data, option_pools, entry_hypernym_lemmas):
     questions = []
     qid = 0
 
@@ -181,11 +223,13 @@ def generate_task(task_type, relation_field, output_filename):
     resource_pair_stats = defaultdict(int)
     prompt_language_stats = defaultdict(int)
 
-    while len(questions) < NUM_QUESTIONS_PER_TYPE:
-        entry = random.choice(data)
+    # Draw only from entries that have the relation, instead of drawing from all and retrying
+    entries_with_relation = [entry for entry in data if entry.get(relation_field)]
+    # Whether English has enough lemmas for the companion en->en questions; the same for every question
+    en_options_available = "en" in option_pools and len(option_pools["en"]["candidates"]) - 1 >= 3
 
-        if not entry.get(relation_field):
-            continue
+    while len(questions) < NUM_QUESTIONS_PER_TYPE:
+        entry = random.choice(entries_with_relation)
 
         from_lang, to_lang, resource_pair = pick_language_pair()
         from_code = from_lang["code"]
@@ -208,17 +252,15 @@ def generate_task(task_type, relation_field, output_filename):
         relation_entry = random.choice(related_entries)
         correct_lemma = relation_entry["translations"][to_code]["lemma"]
 
-        all_candidates = lemma_lookup[to_code] - {correct_lemma}
-        if len(all_candidates) < 3:
+        if to_code not in option_pools or len(option_pools[to_code]["candidates"]) - 1 < 3:
             continue
 
         difficulty_level = random.randint(1, 5)
         distractors, distractor_type = generate_options(
             correct_lemma,
-            all_candidates,
-            semantic_relations,
+            option_pools,
             to_code,
-            entry,
+            entry_hypernym_lemmas[id(entry)],
             relation_field,
             difficulty=difficulty_level
         )
@@ -262,14 +304,12 @@ def generate_task(task_type, relation_field, output_filename):
                 en_relation_entry = random.choice(en_related_entries)
                 en_correct_lemma = en_relation_entry["translations"]["en"]["lemma"]
 
-                en_all_candidates = lemma_lookup["en"] - {en_correct_lemma}
-                if len(en_all_candidates) >= 3:
+                if en_options_available:
                     en_distractors, en_distractor_type = generate_options(
                         en_correct_lemma,
-                        en_all_candidates,
-                        semantic_relations,
+                        option_pools,
                         "en",
-                        entry,
+                        entry_hypernym_lemmas[id(entry)],
                         relation_field,
                         difficulty=difficulty_level
                     )
@@ -299,17 +339,29 @@ def generate_task(task_type, relation_field, output_filename):
         qid += 1
 
     # Save questions to output file
-    with open(output_filename, "w", encoding="utf-8") as f_out:
-        json.dump(questions, f_out, indent=2, ensure_ascii=False)
+    with open(output_filename, "wb") as f_out:
+        f_out.write(orjson.dumps(questions, option=orjson.OPT_INDENT_2))
 
     print(f"Generated {len(questions)} questions for {task_type}, saved to {output_filename}")
 
 
-# Generate hypernymy questions
-generate_task("hypernymy", "hypernyms", "../GeneratedFiles/JsonFiles/Hypernymy/hypernymy_questions.json")
+def main():
+    data = load_data()
+    lemma_lookup, semantic_relations = build_lemma_lookup(data)
+    option_pools = build_option_pools(lemma_lookup, semantic_relations)
+    entry_hypernym_lemmas = build_entry_hypernym_lemmas(data)
+
+    # Generate hypernymy questions
+    generate_task("hypernymy", "hypernyms", "../GeneratedFiles/JsonFiles/Hypernymy/hypernymy_questions.json",
+                  data, option_pools, entry_hypernym_lemmas)
+
+    # Generate meronymy questions
+    generate_task("meronymy", "meronyms", "../GeneratedFiles/JsonFiles/Meronymy/meronymy_questions.json",
+                  data, option_pools, entry_hypernym_lemmas)
+
+    # Similarly for other relations...
 
-# Generate meronymy questions
-generate_task("meronymy", "meronyms", "../GeneratedFiles/JsonFiles/Meronymy/meronymy_questions.json")
 
-# Similarly for other relations...
+if __name__ == "__main__":
+    main()
 
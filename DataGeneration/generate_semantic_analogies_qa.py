@@ -1,12 +1,21 @@
 import json
+import orjson
 import random
 from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
 from babelnet import Language
 from language_config import LANGUAGE_CONFIG
 
 NUM_ANALOGY_QUESTIONS = 5000   # Adjust as needed
 
+# Language names by code, built once from LANGUAGE_CONFIG
+_CODE_TO_NAME = {v["code"]: v["name"] for langs in LANGUAGE_CONFIG.values() for v in langs.values()}
+
+# Resource levels and their language entries as lists, so pick_language_pair needn't copy them per question
+_LEVELS = list(LANGUAGE_CONFIG)
+_LANGS_BY_LEVEL = {level: list(langs.values()) for level, langs in LANGUAGE_CONFIG.items()}
+
 # ---------------------------
 # Load Data
 # ---------------------------
@@ -38,22 +47,17 @@ def build_lemma_lookup(data):
 
 
 def pick_language_pair():
-    levels = list(LANGUAGE_CONFIG.keys())
-    from_level = random.choice(levels)
-    to_level = random.choice(levels)
+    from_level = random.choice(_LEVELS)
+    to_level = random.choice(_LEVELS)
 
-    from_lang = random.choice(list(LANGUAGE_CONFIG[from_level].values()))
-    to_lang = random.choice(list(LANGUAGE_CONFIG[to_level].values()))
+    from_lang = random.choice(_LANGS_BY_LEVEL[from_level])
+    to_lang = random.choice(_LANGS_BY_LEVEL[to_level])
 
     return from_lang, to_lang, f"{from_level}_to_{to_level}"
 
 
 def get_lang_name(lang_code):
-    for level, langs in LANGUAGE_CONFIG.items():
-        for lang, v in langs.items():
-            if v["code"] == lang_code:
-                return v["name"]
-    return None
+    return _CODE_TO_NAME.get(lang_code)
 
 
 # ---------------------------
@@ -63,62 +67,105 @@ def get_lang_name(lang_code):
 lemma_lookup, semantic_relations = build_lemma_lookup(data)
 generation_time = datetime.utcnow().isoformat() + "Z"
 
-def generate_distractors(correct_lemma, all_candidates, semantic_relations,
+# Each language's lemmas as a tuple, sampled directly instead of copying the set minus the answer per question
+candidate_tuples = {lang: tuple(lemmas) for lang, lemmas in lemma_lookup.items()}
+
+# Semantic distractor pools as tuples, built once per language (and relation) rather than copied per question
+_cohyponym_pools = {}
+_semantic_pools = {}
+
+
+def get_cohyponym_pool(semantic_relations, target_lang):
+    pool = _cohyponym_pools.get(target_lang)
+    if pool is None:
+        sem_words = semantic_relations[target_lang].get("cohyponyms", set()) if target_lang in semantic_relations else set()
+        pool = _cohyponym_pools[target_lang] = tuple(sem_words)
+    return pool
+
+
+def get_semantic_pool(semantic_relations, target_lang, relation_type):
+    key = (target_lang, relation_type)
+    pool = _semantic_pools.get(key)
+    if pool is None:
+        sem_pool = set()
+        if target_lang in semantic_relations:
+            sem_pool.update(semantic_relations[target_lang].get(relation_type, set()))
+            sem_pool.update(semantic_relations[target_lang].get("cohyponyms", set()))
+        pool = _semantic_pools[key] = tuple(sem_pool)
+    return pool
+
+
+def generate_distractors(correct_lemma, candidates, semantic_relations,
                          target_lang, relation_type, n_choices=4, difficulty=3):
+    """Pick distractors from candidates, a tuple of target-language lemmas that includes correct_lemma."""
 
     distractors = set()
 
     if difficulty == 1:
-        distractors = set(random.sample(list(all_candidates), min(n_choices - 1, len(all_candidates))))
+        distractors = set(random.sample(candidates, min(n_choices - 1, len(candidates))))
         distractor_type = "random_unrelated"
 
     elif difficulty == 2:
-        random_words = set(random.sample(list(all_candidates), min(n_choices - 2, len(all_candidates))))
-        sem_words = semantic_relations[target_lang].get("cohyponyms", set()) if target_lang in semantic_relations else set()
+        random_words = set(random.sample(candidates, min(n_choices - 2, len(candidates))))
+        sem_words = get_cohyponym_pool(semantic_relations, target_lang)
         if sem_words:
-            sem_sample = set(random.sample(list(sem_words), min(1, len(sem_words))))
+            sem_sample = set(random.sample(sem_words, min(1, len(sem_words))))
         else:
             sem_sample = set()
         distractors = random_words.union(sem_sample)
         distractor_type = "mixed_random_semantic"
 
     elif difficulty >= 3:
-        sem_pool = set()
-        if target_lang in semantic_relations:
-            sem_pool.update(semantic_relations[target_lang].get(relation_type, set()))
-            sem_pool.update(semantic_relations[target_lang].get("cohyponyms", set()))
+        sem_pool = get_semantic_pool(semantic_relations, target_lang, relation_type)
         if len(sem_pool) >= n_choices - 1:
-            distractors = set(random.sample(list(sem_pool), n_choices - 1))
+            distractors = set(random.sample(sem_pool, n_choices - 1))
         else:
-            distractors = sem_pool.union(
-                set(random.sample(list(all_candidates), min(n_choices - 1 - len(sem_pool), len(all_candidates))))
+            distractors = set(sem_pool).union(
+                set(random.sample(candidates, min(n_choices - 1 - len(sem_pool), len(candidates))))
             )
         distractor_type = "semantically_related"
 
     distractors.discard(correct_lemma)
-    while len(distractors) < (n_choices - 1):
-        remaining = all_candidates - distractors - {correct_lemma}
-        if remaining:
-            distractors.add(random.choice(list(remaining)))
-        else:
-            break
+    # Top up by rejection sampling; the correct lemma is always in candidates,
+    # so at most len(candidates) - 1 distinct distractors exist.
+    target_size = min(n_choices - 1, len(candidates) - 1)
+    while len(distractors) < target_size:
+        word = candidates[random.randrange(len(candidates))]
+        if word != correct_lemma:
+            distractors.add(word)
 
     return list(distractors), distractor_type
 
 
+@lru_cache(maxsize=None)
+def prompt_template(from_code, to_code):
+    """Analogy prompt for a language pair, with {A}, {B} and {C} left for the lemmas."""
+    from_lang_name = get_lang_name(from_code)
+    to_lang_name = get_lang_name(to_code)
+    return (
+        f"Complete the analogy:\n\n"
+        f"{{A}} ({from_lang_name}) is to {{B}} ({from_lang_name})\n"
+        f"as\n"
+        f"{{C}} ({to_lang_name}) is to ____?\n\n"
+        f"Choose the correct option in {to_lang_name}:"
+    )
+
+
 def generate_analogies(output_filename):
 
     analogies = []
     qid = 0
 
+    # Entries grouped by the relations they have, so draws needn't be retried or rescan the data
+    relation_types = ["hypernyms", "hyponyms", "meronyms", "holonyms", "cohyponyms"]
+    entries_with_relation = {rel: [e for e in data if e.get(rel)] for rel in relation_types}
+    entries_with_any_relation = [e for e in data if any(e.get(rel) for rel in relation_types)]
+
     while len(analogies) < NUM_ANALOGY_QUESTIONS:
-        entry = random.choice(data)
+        entry = random.choice(entries_with_any_relation)
 
         # Pick a semantic relation to use
-        candidate_relations = [rel for rel in ["hypernyms", "hyponyms", "meronyms", "holonyms", "cohyponyms"]
-                               if entry.get(rel)]
-        if not candidate_relations:
-            continue
+        candidate_relations = [rel for rel in relation_types if entry.get(rel)]
 
         relation_type = random.choice(candidate_relations)
         rel_entries = entry[relation_type]
@@ -139,14 +186,14 @@ def generate_analogies(output_filename):
         A_lemma = entry["translations"][from_code]["lemma"]
         B_lemma = relation_entry["translations"][from_code]["lemma"]
 
-        # Find a second analogy pair (C, D) in the same relation
-        candidates_for_second_pair = [
-            e for e in data if e != entry and e.get(relation_type)
-        ]
-        if not candidates_for_second_pair:
+        # Find a second analogy pair (C, D) in the same relation; entry itself is in the list
+        candidates_for_second_pair = entries_with_relation[relation_type]
+        if len(candidates_for_second_pair) < 2:
             continue
 
-        second_entry = random.choice(candidates_for_second_pair)
+        second_entry = entry
+        while second_entry is entry:
+            second_entry = random.choice(candidates_for_second_pair)
         second_rel_entries = second_entry[relation_type]
         second_relation_entry = random.choice(second_rel_entries)
 
@@ -159,14 +206,14 @@ def generate_analogies(output_filename):
         D_correct_lemma = second_relation_entry["translations"][to_code]["lemma"]
 
         # Generate distractors
-        all_candidates = lemma_lookup[to_code] - {D_correct_lemma}
-        if len(all_candidates) < 3:
+        candidates = candidate_tuples.get(to_code, ())
+        if len(candidates) - 1 < 3:
             continue
 
         difficulty_level = random.randint(1, 5)
         distractors, distractor_type = generate_distractors(
             D_correct_lemma,
-            all_candidates,
+            candidates,
             semantic_relations,
             to_code,
             relation_type,
@@ -178,13 +225,7 @@ def generate_analogies(output_filename):
         answer_index = options.index(D_correct_lemma)
 
         # Build prompt text
-        prompt_text = (
-            f"Complete the analogy:\n\n"
-            f"{A_lemma} ({get_lang_name(from_code)}) is to {B_lemma} ({get_lang_name(from_code)})\n"
-            f"as\n"
-            f"{C_lemma} ({get_lang_name(to_code)}) is to ____?\n\n"
-            f"Choose the correct option in {get_lang_name(to_code)}:"
-        )
+        prompt_text = prompt_template(from_code, to_code).format(A=A_lemma, B=B_lemma, C=C_lemma)
 
         question = {
             "id": f"analogy_{qid}_{from_code}_to_{to_code}",
@@ -205,8 +246,8 @@ def generate_analogies(output_filename):
         qid += 1
 
     # Save
-    with open(output_filename, "w", encoding="utf-8") as f_out:
-        json.dump(analogies, f_out, indent=2, ensure_ascii=False)
+    with open(output_filename, "wb") as f_out:
+        f_out.write(orjson.dumps(analogies, option=orjson.OPT_INDENT_2))
 
     print(f"Generated {len(analogies)} semantic analogy questions. Saved to {output_filename}")
 
@@ -1,5 +1,8 @@
 import json
 import random
+import re
+
+import orjson
 
 # ABSOLUTE paths
 INPUT_PATH = r"D:\Masters In Germany\Computer Science\Semester 4\Practical_NLP\Babelnet_Client\GeneratedFiles\JsonFiles\Hypernymy\hypernymy_questions_all.json"
@@ -8,19 +11,59 @@ OUTPUT_PATH = r"D:\Masters In Germany\Computer Science\Semester 4\Practical_NLP\
 N_SAMPLES = 4000
 SEED = 42
 
-# load JSON array
-with open(INPUT_PATH, "r", encoding="utf-8") as f:
-    data = json.load(f)
+_WHITESPACE = re.compile(r"\s*")
+
 
-# shuffle
+def iter_json_array(f, chunk_size=1 << 16):
+    """Yield the items of the top-level JSON array in f one at a time, reading f in chunks."""
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+    expected = "["  # then "item" after "[" or ",", and ",]" after an item
+    while True:
+        pos = _WHITESPACE.match(buf, pos).end()
+        if pos < len(buf):
+            char = buf[pos]
+            if expected == "item" and char != "]":
+                try:
+                    item, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    end = None
+                # An item is only complete once a delimiter follows it (a number like "1e5" could be
+                # cut after "1" at a chunk boundary); otherwise read more input and decode it again
+                if end is not None and (eof or (end < len(buf) and buf[end] in " \t\n\r,]")):
+                    yield item
+                    pos, expected = end, ",]"
+                    continue
+            elif char in ("]" if expected == "item" else expected):
+                if char == "]":
+                    return
+                pos, expected = pos + 1, "item"
+                continue
+            else:
+                raise ValueError(f"Unexpected {char!r} in JSON array")
+        if eof:
+            raise ValueError("Malformed or truncated JSON array")
+        chunk = f.read(chunk_size)
+        buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+
+
+# stream the JSON array and keep a uniform sample of N records (reservoir sampling)
 random.seed(SEED)
-random.shuffle(data)
+subset = []
+with open(INPUT_PATH, "r", encoding="utf-8") as f:
+    for i, item in enumerate(iter_json_array(f)):
+        if i < N_SAMPLES:
+            subset.append(item)
+        else:
+            j = random.randint(0, i)
+            if j < N_SAMPLES:
+                subset[j] = item
 
-# take the first N
-subset = data[:N_SAMPLES]
+# shuffle the sample itself so the output order is random too
+random.shuffle(subset)
 
 # write JSON array
-with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-    json.dump(subset, f, indent=2, ensure_ascii=False)
+with open(OUTPUT_PATH, "wb") as f:
+    f.write(orjson.dumps(subset, option=orjson.OPT_INDENT_2))
 
 print(f"Wrote {len(subset)} records to {OUTPUT_PATH}")
@@ -137,9 +137,8 @@ if __name__ == "__main__":
     if not json_files:
         raise FileNotFoundError(f"No collected_data_*.json found in {consolidated_dir}")
 
-    # Sort newest first
-    json_files.sort(key=os.path.getmtime, reverse=True)
-    input_file = json_files[0]
+    # Newest first; only the top one is needed, so no full sort
+    input_file = max(json_files, key=os.path.getmtime)
     print(f"Using latest collected data: {input_file}")
 
     # Output filenames based on timestamp in collected_data filename
@@ -1,5 +1,5 @@
 import os
-import json
+import orjson
 import pandas as pd
 from glob import glob
 
@@ -17,13 +17,13 @@ class DeepAnalyzer:
 
         print(f"Loading {len(jsonl_files)} JSONL files for {model_name}")
         for file_path in jsonl_files:
-            with open(file_path, "r", encoding="utf-8") as f:
+            with open(file_path, "rb") as f:
                 for line in f:
                     try:
-                        record = json.loads(line)
+                        record = orjson.loads(line)
                         record["model_name"] = model_name
                         all_records.append(record)
-                    except json.JSONDecodeError:
+                    except orjson.JSONDecodeError:
                         continue
         print(f"Loaded {len(all_records)} records for {model_name}")
         return all_records
@@ -1,4 +1,4 @@
-import json
+import orjson
 import pandas as pd
 import os
 import glob
@@ -45,15 +45,15 @@ class MultiModelMultilingualAnalyzer:
         model_data = []
         for file_path in jsonl_files:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
+                with open(file_path, 'rb') as f:
                     for line_num, line in enumerate(f, 1):
                         try:
-                            data = json.loads(line.strip())
+                            data = orjson.loads(line)
                             # Add model and source file information
                             data['model_name'] = model_name
                             data['source_file'] = file_path.name
                             model_data.append(data)
-                        except json.JSONDecodeError as e:
+                        except orjson.JSONDecodeError as e:
                             print(f"Error parsing line {line_num} in {file_path.name}: {e}")
             except Exception as e:
                 print(f"Error reading {file_path.name}: {e}")